@@ -20,7 +20,8 @@ from backend.instant_answer.search_engine import (
 )
 from backend.instant_answer.summary_generator import (
     InstantAnswer,
-    SummaryGenerator
+    SummaryGenerator,
+    SemanticSummaryCache
 )
 from backend.instant_answer.storage import (
     StoredMessage,
@@ -47,6 +48,7 @@ __all__ = [
     "SemanticSearchEngine",
     "InstantAnswer",
     "SummaryGenerator",
+    "SemanticSummaryCache",
     "StoredMessage",
     "MessageStorageService",
     "InstantAnswerService",
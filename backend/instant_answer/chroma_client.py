@@ -94,7 +94,12 @@ def init_chromadb_collection(
             name=config.chroma_collection_name,
             metadata={
                 "description": "Techline room messages with embeddings for instant answer recall",
-                "hnsw:space": "cosine"  # Use cosine similarity for semantic search
+                # Use cosine similarity for semantic search. hnswlib normalizes
+                # each vector once (on add, and once per query) and then runs
+                # inner product, so an "ip" space with pre-normalized vectors
+                # would be no faster; "cosine" also keeps search scores valid
+                # for any embeddings already stored.
+                "hnsw:space": "cosine"
             }
         )
         
@@ -23,7 +23,12 @@ class MessageType(Enum):
     DISCUSSION = "discussion"
 
 
-@dataclass
+# Lookup table from stored value to member; avoids Enum.__call__ on hot
+# metadata-parsing paths
+MESSAGE_TYPE_BY_VALUE = {member.value: member for member in MessageType}
+
+
+@dataclass(frozen=True)
 class MessageClassification:
     """
     Classification result for a message.
@@ -305,12 +305,7 @@ class FastMessageIndexer:
             return await self.instant_answer_service.tagger.tag_message(message)
         except Exception as e:
             logger.warning(f"Tagging failed: {e}")
-            return MessageTags(
-                topic_tags=[],
-                tech_keywords=[],
-                contains_code=False,
-                code_language=None
-            )
+            return MessageTags.EMPTY
 
 
 async def fast_index_historical_messages(
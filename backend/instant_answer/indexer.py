@@ -275,12 +275,7 @@ class MessageIndexer:
         except Exception as e:
             logger.warning(f"Tagging failed during indexing: {e}")
             # Fallback to empty tags
-            return MessageTags(
-                topic_tags=[],
-                tech_keywords=[],
-                contains_code=False,
-                code_language=None
-            )
+            return MessageTags.EMPTY
     
     async def _store_message_safe(
         self,
@@ -9,23 +9,30 @@ Requirements: 3.1, 3.2, 3.3, 3.4, 3.5, 8.2, 8.4
 
 import logging
 import asyncio
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import chromadb
+import numpy as np
 
 from backend.instant_answer.classifier import MessageType
-from backend.instant_answer.tagger import MessageTags
+from backend.instant_answer.tagger import MessageTags, split_tag_string
 from backend.instant_answer.retry_utils import retry_with_backoff, with_timeout
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """
     Single search result from ChromaDB.
     
+    Results are immutable and slotted: no per-instance __dict__, and
+    attribute reads are slot lookups.
+    
     Attributes:
         message_id: Unique identifier for the message
         message_text: The message content
@@ -46,6 +53,105 @@ class SearchResult:
     room: str
 
 
+def _parse_timestamp(metadata: dict) -> datetime:
+    """Parse the ISO timestamp stored in ChromaDB metadata."""
+    try:
+        return datetime.fromisoformat(metadata.get('timestamp', ''))
+    except (ValueError, TypeError):
+        return datetime.now()
+
+
+def _parse_tag_list(value) -> List[str]:
+    """Read a tag field stored as a list (tests) or a joined string (storage)."""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return split_tag_string(value)
+    return []
+
+
+def _parse_tags(metadata: dict) -> MessageTags:
+    """Reconstruct MessageTags from ChromaDB metadata."""
+    return MessageTags(
+        topic_tags=_parse_tag_list(metadata.get('topic_tags', '')),
+        tech_keywords=_parse_tag_list(metadata.get('tech_keywords', '')),
+        contains_code=metadata.get('contains_code', False),
+        code_language=metadata.get('code_language') or None
+    )
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query embeddings with a time-to-live.
+    
+    Users often repeat or re-send the same question, and each embedding
+    is a Gemini API round-trip. Entries are keyed on (text, model,
+    task_type) so a model change never serves a stale vector. Vectors are
+    stored as float32 arrays, a fraction of the size of a list of floats.
+    
+    Attributes:
+        max_size: Maximum number of cached embeddings (0 disables caching)
+        ttl_seconds: How long an entry stays valid
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that required an API call
+    """
+    
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, str, str], Tuple[float, np.ndarray]] = OrderedDict()
+    
+    def get(self, key: Tuple[str, str, str]) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding.
+        
+        Args:
+            key: (text, model, task_type) tuple
+        
+        Returns:
+            The cached embedding, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, embedding = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return embedding
+    
+    def put(self, key: Tuple[str, str, str], embedding: np.ndarray) -> None:
+        """
+        Store an embedding, evicting the least recently used entry if full.
+        
+        Args:
+            key: (text, model, task_type) tuple
+            embedding: Embedding vector to cache
+        """
+        if self.max_size <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached embeddings."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class SemanticSearchEngine:
     """
     Semantic search using ChromaDB and Gemini embeddings.
@@ -60,11 +166,22 @@ class SemanticSearchEngine:
     Requirements: 3.1, 3.2, 3.3, 3.4, 3.5
     """
     
+    # Maximum number of texts Gemini accepts in one batch embedding request
+    EMBEDDING_BATCH_SIZE = 100
+    
+    # Model used for query embeddings (must match the stored documents)
+    QUERY_EMBEDDING_MODEL = "models/text-embedding-004"
+    
     def __init__(
         self,
         gemini_service,
         chroma_collection: chromadb.Collection,
-        embedding_model: str = "models/text-embedding-004"
+        embedding_model: str = "models/text-embedding-004",
+        embedding_cache_size: int = 256,
+        embedding_cache_ttl: float = 3600.0,
+        overfetch_factor: int = 2,
+        max_n_results: int = 100,
+        embedding_client=None
     ):
         """
         Initialize the semantic search engine.
@@ -73,12 +190,29 @@ class SemanticSearchEngine:
             gemini_service: GeminiService instance for embedding generation
             chroma_collection: ChromaDB collection for vector search
             embedding_model: Gemini embedding model name
+            embedding_cache_size: Maximum cached query embeddings (0 disables)
+            embedding_cache_ttl: Seconds a cached query embedding stays valid
+            overfetch_factor: Candidates fetched per requested result, leaving
+                headroom for the similarity threshold
+            max_n_results: Upper bound on candidates fetched per query
+            embedding_client: Gemini GenerativeServiceClient for embeddings
+                (defaults to the SDK's shared client, resolved on first use)
         
         Requirements: 3.1, 3.2
         """
         self.gemini_service = gemini_service
         self.chroma_collection = chroma_collection
         self.embedding_model = embedding_model
+        self.embedding_cache = QueryEmbeddingCache(embedding_cache_size, embedding_cache_ttl)
+        self.overfetch_factor = overfetch_factor
+        self.max_n_results = max_n_results
+        
+        # Held for the engine's lifetime so every embedding call reuses the
+        # same gRPC channel
+        self._embedding_client = embedding_client
+        
+        # Embedding requests currently waiting on Gemini, keyed like the cache
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
     
     async def search(
         self,
@@ -113,7 +247,6 @@ class SemanticSearchEngine:
         
         Requirements: 3.1, 3.2, 3.3, 3.4, 3.5, 8.2, 8.4
         """
-        import time
         start_time = time.time()
         
         try:
@@ -143,21 +276,13 @@ class SemanticSearchEngine:
             )
             
             # Build metadata filter with proper ChromaDB operators
-            if message_type_filter:
-                where_filter = {
-                    "$and": [
-                        {"room": {"$eq": room_filter}},
-                        {"message_type": {"$eq": message_type_filter.value}}
-                    ]
-                }
-            else:
-                where_filter = {"room": {"$eq": room_filter}}
+            where_filter = self._build_where_filter(room_filter, message_type_filter)
             
             # Query ChromaDB for similar vectors with retry (1 retry, 0.5s delay)
             query_start = time.time()
             results = await retry_with_backoff(
                 self._query_chromadb,
-                query_embedding,
+                [query_embedding],
                 limit,
                 where_filter,
                 max_retries=1,
@@ -172,12 +297,8 @@ class SemanticSearchEngine:
                 f"duration={query_time:.3f}s"
             )
             
-            # Parse and rank results
-            search_results = self._parse_search_results(results, min_similarity)
-            
-            # Sort by similarity score (descending) and limit
-            search_results.sort(key=lambda x: x.similarity_score, reverse=True)
-            search_results = search_results[:limit]
+            # Parse and rank results (already sorted by similarity, descending)
+            search_results = self._parse_search_results(results, min_similarity, limit=limit)
             
             total_time = time.time() - start_time
             
@@ -213,9 +334,151 @@ class SemanticSearchEngine:
             )
             raise
     
+    async def batch_search(
+        self,
+        queries: List[str],
+        room_filter: str = "Techline",
+        message_type_filter: Optional[MessageType] = MessageType.ANSWER,
+        limit: int = 5,
+        min_similarity: float = 0.7
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several queries with one embedding batch and one ChromaDB query.
+        
+        All queries share the same filters. Embeddings come from
+        generate_embeddings, so cached queries are not re-embedded, and
+        ChromaDB receives every query vector in a single call.
+        
+        Args:
+            queries: The search query texts
+            room_filter: Filter results to specific room (default: "Techline")
+            message_type_filter: Filter by message type (default: ANSWER)
+            limit: Maximum number of results to return per query
+            min_similarity: Minimum similarity score threshold (0.0-1.0)
+        
+        Returns:
+            One list of SearchResult objects per query, in query order,
+            each ranked by similarity score
+        
+        Raises:
+            Exception: If search fails (caller should handle gracefully)
+        
+        Requirements: 3.1, 3.2, 3.3, 3.4, 3.5
+        """
+        if not queries:
+            return []
+        
+        start_time = time.time()
+        
+        try:
+            query_embeddings = await self.generate_embeddings(queries)
+            where_filter = self._build_where_filter(room_filter, message_type_filter)
+            
+            results = await retry_with_backoff(
+                self._query_chromadb,
+                query_embeddings,
+                limit,
+                where_filter,
+                max_retries=1,
+                initial_delay=0.5,
+                operation_name="chromadb_query"
+            )
+            
+            batch_results = []
+            for row in range(len(queries)):
+                batch_results.append(
+                    self._parse_search_results(results, min_similarity, row, limit)
+                )
+            
+            logger.info(
+                f"[SEARCH] Batch search complete | "
+                f"queries={len(queries)} "
+                f"results={sum(len(r) for r in batch_results)} "
+                f"total_time={time.time() - start_time:.3f}s"
+            )
+            
+            return batch_results
+        
+        except Exception as e:
+            logger.error(
+                f"[SEARCH] Batch search failed | "
+                f"error={str(e)} "
+                f"queries={len(queries)} "
+                f"duration={time.time() - start_time:.3f}s",
+                exc_info=True
+            )
+            raise
+    
+    async def warmup(self) -> bool:
+        """
+        Issue a throwaway query so the first user search is not a cold one.
+        
+        ChromaDB loads the HNSW index lazily on the first query against a
+        collection. This queries with a stored embedding (so the dimension
+        always matches) and discards the result. Failures are logged and
+        ignored, since warmup is only an optimization.
+        
+        Returns:
+            True if a warmup query ran, False if the collection is empty or
+            the query failed
+        """
+        try:
+            sample = await asyncio.to_thread(
+                self.chroma_collection.get,
+                limit=1,
+                include=["embeddings"]
+            )
+            embeddings = sample.get('embeddings') if sample else None
+            if not embeddings:
+                logger.debug("[SEARCH] Warmup skipped | collection is empty")
+                return False
+            
+            start_time = time.time()
+            await asyncio.to_thread(
+                self.chroma_collection.query,
+                query_embeddings=[list(embeddings[0])],
+                n_results=1,
+                include=[]
+            )
+            logger.info(f"[SEARCH] Warmup complete | duration={time.time() - start_time:.3f}s")
+            return True
+        
+        except Exception as e:
+            logger.warning(f"[SEARCH] Warmup failed | error={str(e)}")
+            return False
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _build_where_filter(
+        room_filter: str,
+        message_type_filter: Optional[MessageType]
+    ) -> dict:
+        """
+        Build the ChromaDB metadata filter for a search.
+        
+        Filters are memoized per (room, message type), so repeated searches
+        reuse the same dict. ChromaDB only reads the filter; callers must
+        not mutate it.
+        
+        Args:
+            room_filter: Room to restrict results to
+            message_type_filter: Message type to restrict results to, if any
+        
+        Returns:
+            ChromaDB where filter using explicit $eq operators
+        """
+        if message_type_filter:
+            return {
+                "$and": [
+                    {"room": {"$eq": room_filter}},
+                    {"message_type": {"$eq": message_type_filter.value}}
+                ]
+            }
+        return {"room": {"$eq": room_filter}}
+    
     async def _query_chromadb(
         self,
-        query_embedding: List[float],
+        query_embeddings: List[np.ndarray],
         limit: int,
         where_filter: dict
     ) -> dict:
@@ -223,9 +486,11 @@ class SemanticSearchEngine:
         Query ChromaDB with the given parameters.
         
         This is a separate method to allow retry logic to be applied.
+        Embeddings are converted to plain lists here, at the ChromaDB
+        boundary, since this ChromaDB version validates list input.
         
         Args:
-            query_embedding: The query embedding vector
+            query_embeddings: Query embedding vectors, one result row per vector
             limit: Number of results to return
             where_filter: Metadata filters
         
@@ -237,142 +502,349 @@ class SemanticSearchEngine:
         # ChromaDB query is synchronous, wrap in asyncio.to_thread
         return await asyncio.to_thread(
             self.chroma_collection.query,
-            query_embeddings=[query_embedding],
-            n_results=limit * 2,  # Get more results to filter by threshold
+            query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
+            n_results=self._n_results(limit),
             where=where_filter,
             include=["documents", "metadatas", "distances"]
         )
     
-    async def generate_embedding(self, text: str) -> List[float]:
+    def _n_results(self, limit: int) -> int:
+        """
+        Number of candidates to request from ChromaDB for a result limit.
+        
+        HNSW work grows with n_results, so fetch only enough headroom for
+        the similarity threshold, capped at max_n_results.
+        
+        Args:
+            limit: Number of results the caller wants
+        
+        Returns:
+            n_results to pass to ChromaDB
+        """
+        return max(1, min(limit * self.overfetch_factor, self.max_n_results))
+    
+    def cached_embedding(
+        self,
+        text: str,
+        task_type: str = "retrieval_query"
+    ) -> Optional[np.ndarray]:
+        """
+        Return the cached embedding for text without calling the API.
+        
+        Args:
+            text: The text that was embedded
+            task_type: Gemini task type used for the embedding
+        
+        Returns:
+            The cached embedding, or None if it is not cached
+        """
+        return self.embedding_cache.get((text, self.QUERY_EMBEDDING_MODEL, task_type))
+    
+    async def generate_embedding(
+        self,
+        text: str,
+        task_type: str = "retrieval_query"
+    ) -> np.ndarray:
         """
         Generate embedding vector using Gemini API.
         
         Uses Google's Gemini embedding model to convert text into a
         high-dimensional vector representation for semantic similarity search.
+        Repeated texts are served from the query embedding cache, and
+        concurrent requests for the same text share a single API call.
         
         Args:
             text: The text to embed
+            task_type: Gemini task type. Search queries use "retrieval_query";
+                indexed messages are embedded as "retrieval_document"
         
         Returns:
-            List of floats representing the embedding vector
+            float32 array representing the embedding vector
         
         Raises:
             Exception: If embedding generation fails
         
         Requirements: 3.1
         """
+        model = self.QUERY_EMBEDDING_MODEL
+        cache_key = (text, model, task_type)
+        
+        cached = self.embedding_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Query embedding served from cache")
+            return cached
+        
+        # Join an in-flight request for the same text instead of starting another
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_embedding(text, model, task_type))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        
         try:
-            import google.generativeai as genai
-            
-            # Generate embedding using Gemini API (newer model)
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=text,
-                task_type="retrieval_document"
-            )
-            
-            embedding = result['embedding']
-            
-            logger.debug(f"Generated embedding with {len(embedding)} dimensions")
-            
-            return embedding
+            # Shield so a timed-out caller does not cancel the shared request
+            return await asyncio.shield(task)
         
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             raise
     
+    async def _fetch_embedding(self, text: str, model: str, task_type: str) -> np.ndarray:
+        """
+        Call the Gemini embedding API for one text and cache the result.
+        
+        Args:
+            text: The text to embed
+            model: Gemini embedding model name
+            task_type: Gemini embedding task type
+        
+        Returns:
+            float32 array representing the embedding vector
+        """
+        # Generate embedding using Gemini API (newer model); the client is
+        # synchronous, so run it off the event loop
+        embedding = (await asyncio.to_thread(
+            self._request_embeddings, [text], model, task_type
+        ))[0]
+        
+        logger.debug(f"Generated embedding with {len(embedding)} dimensions")
+        
+        self.embedding_cache.put((text, model, task_type), embedding)
+        return embedding
+    
+    def _request_embeddings(self, texts: List[str], model: str, task_type: str) -> np.ndarray:
+        """
+        Call the Gemini embedding API and read vectors straight from the response.
+        
+        genai.embed_content converts every response protobuf to a dict
+        before returning it, which costs about 1 ms per 768-dimension
+        vector. _request_embeddings_direct sends the same requests through
+        the engine's generative client and copies the repeated float field
+        directly into NumPy.
+        
+        That path relies on SDK internals rather than public API, so any
+        exception from it falls back to genai.embed_content. A genuine API
+        error is then raised by the public call.
+        
+        Blocking; callers run it in a worker thread.
+        
+        Args:
+            texts: Texts to embed (one request, or one batch request if several)
+            model: Gemini embedding model name
+            task_type: Gemini embedding task type
+        
+        Returns:
+            float32 array with one row per text
+        """
+        try:
+            return self._request_embeddings_direct(texts, model, task_type)
+        except Exception as e:
+            logger.warning(f"Embedding fast path failed ({e!r}); using genai.embed_content")
+            return self._request_embeddings_public(texts, model, task_type)
+    
+    def _request_embeddings_direct(self, texts: List[str], model: str, task_type: str) -> np.ndarray:
+        """
+        Embed texts through the engine's generative client.
+        
+        Args:
+            texts: Texts to embed
+            model: Gemini embedding model name
+            task_type: Gemini embedding task type
+        
+        Returns:
+            float32 array with one row per text
+        """
+        import google.ai.generativelanguage as glm
+        from google.generativeai.types.content_types import to_content
+        from google.generativeai.embedding import to_task_type
+        from google.generativeai.client import get_default_generative_client
+        
+        client = self._embedding_client
+        if client is None:
+            client = self._embedding_client = get_default_generative_client()
+        
+        task = to_task_type(task_type)
+        requests = [
+            glm.EmbedContentRequest(model=model, content=to_content(text), task_type=task)
+            for text in texts
+        ]
+        
+        if len(requests) == 1:
+            response = client.embed_content(requests[0])
+            return np.asarray([response.embedding.values], dtype=np.float32)
+        
+        response = client.batch_embed_contents(
+            glm.BatchEmbedContentsRequest(model=model, requests=requests)
+        )
+        return np.asarray(
+            [embedding.values for embedding in response.embeddings],
+            dtype=np.float32
+        )
+    
+    @staticmethod
+    def _request_embeddings_public(texts: List[str], model: str, task_type: str) -> np.ndarray:
+        """
+        Embed texts through the public genai.embed_content API.
+        
+        Slower than _request_embeddings_direct (the SDK converts each
+        response to a dict first) but independent of SDK internals.
+        
+        Args:
+            texts: Texts to embed
+            model: Gemini embedding model name
+            task_type: Gemini embedding task type
+        
+        Returns:
+            float32 array with one row per text
+        """
+        import google.generativeai as genai
+        
+        if len(texts) == 1:
+            result = genai.embed_content(model=model, content=texts[0], task_type=task_type)
+            return np.asarray([result['embedding']], dtype=np.float32)
+        
+        result = genai.embed_content(model=model, content=texts, task_type=task_type)
+        return np.asarray(result['embedding'], dtype=np.float32)
+    
+    def _finish_inflight(self, cache_key: Tuple[str, str, str], task: asyncio.Task) -> None:
+        """
+        Forget a completed in-flight embedding request.
+        
+        Args:
+            cache_key: Key the request was registered under
+            task: The completed request
+        """
+        self._inflight.pop(cache_key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter timed out
+            task.exception()
+    
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        task_type: str = "retrieval_query"
+    ) -> List[np.ndarray]:
+        """
+        Generate embedding vectors for several texts.
+        
+        Cached texts are served from the query embedding cache. The remaining
+        distinct texts are sent to Gemini in batches of EMBEDDING_BATCH_SIZE,
+        one API call per batch instead of one per text.
+        
+        Args:
+            texts: The texts to embed
+            task_type: Gemini task type (default: "retrieval_query")
+        
+        Returns:
+            float32 embedding vectors in the same order as texts
+        
+        Raises:
+            Exception: If embedding generation fails
+        
+        Requirements: 3.1
+        """
+        model = self.QUERY_EMBEDDING_MODEL
+        
+        embeddings: dict = {}
+        missing: List[str] = []
+        for text in texts:
+            if text in embeddings:
+                continue
+            cached = self.embedding_cache.get((text, model, task_type))
+            embeddings[text] = cached
+            if cached is None:
+                missing.append(text)
+        
+        if missing:
+            try:
+                for start in range(0, len(missing), self.EMBEDDING_BATCH_SIZE):
+                    batch = missing[start:start + self.EMBEDDING_BATCH_SIZE]
+                    
+                    # A list of contents is embedded in a single request
+                    vectors = await asyncio.to_thread(
+                        self._request_embeddings, batch, model, task_type
+                    )
+                    for text, embedding in zip(batch, vectors):
+                        embeddings[text] = embedding
+                        self.embedding_cache.put((text, model, task_type), embedding)
+                
+                logger.debug(
+                    f"Generated {len(missing)} embeddings for {len(texts)} texts in batch"
+                )
+            
+            except Exception as e:
+                logger.error(f"Batch embedding generation failed: {e}")
+                raise
+        
+        return [embeddings[text] for text in texts]
+    
     def _parse_search_results(
         self,
         results: dict,
-        min_similarity: float
+        min_similarity: float,
+        row: int = 0,
+        limit: Optional[int] = None
     ) -> List[SearchResult]:
         """
         Parse ChromaDB query results into SearchResult objects.
         
         Converts ChromaDB's raw query results into structured SearchResult
         objects, filtering by similarity threshold and extracting metadata.
+        Score conversion, thresholding and ranking are done on NumPy arrays,
+        so only the surviving top results are turned into Python objects.
         
         Args:
             results: Raw results from ChromaDB query
             min_similarity: Minimum similarity threshold
+            row: Which query's results to parse when several were batched
+            limit: Maximum number of results to build (all if None)
         
         Returns:
-            List of SearchResult objects above threshold
+            List of SearchResult objects above threshold, highest similarity first
         
         Requirements: 3.4, 3.5
         """
         search_results = []
         
         # ChromaDB returns results as lists within lists
-        if not results or not results.get('ids') or not results['ids'][0]:
+        if not results or not results.get('ids') or not results['ids'][row]:
             return search_results
         
-        ids = results['ids'][0]
-        documents = results['documents'][0]
-        metadatas = results['metadatas'][0]
-        distances = results['distances'][0]
+        ids = results['ids'][row]
+        documents = results['documents'][row]
+        metadatas = results['metadatas'][row]
+        distances = results['distances'][row]
         
-        for i in range(len(ids)):
-            # Convert distance to similarity score (cosine similarity)
-            # ChromaDB returns cosine distance, so similarity = 1 - distance
-            similarity_score = 1.0 - distances[i]
-            
-            # Filter by similarity threshold
-            if similarity_score < min_similarity:
-                logger.debug(
-                    f"Filtering result {ids[i]} with similarity {similarity_score:.3f} "
-                    f"(below threshold {min_similarity})"
-                )
-                continue
-            
-            metadata = metadatas[i]
-            
-            # Parse timestamp
-            timestamp_str = metadata.get('timestamp', '')
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str)
-            except (ValueError, TypeError):
-                timestamp = datetime.now()
-            
-            # Reconstruct MessageTags from metadata
-            # Handle both list format (from tests) and string format (from storage)
-            topic_tags_raw = metadata.get('topic_tags', '')
-            if isinstance(topic_tags_raw, list):
-                topic_tags = topic_tags_raw
-            elif isinstance(topic_tags_raw, str):
-                topic_tags = [tag.strip() for tag in topic_tags_raw.split(',') if tag.strip()] if topic_tags_raw else []
-            else:
-                topic_tags = []
-            
-            tech_keywords_raw = metadata.get('tech_keywords', '')
-            if isinstance(tech_keywords_raw, list):
-                tech_keywords = tech_keywords_raw
-            elif isinstance(tech_keywords_raw, str):
-                tech_keywords = [kw.strip() for kw in tech_keywords_raw.split(',') if kw.strip()] if tech_keywords_raw else []
-            else:
-                tech_keywords = []
-            
-            code_language = metadata.get('code_language', '')
-            code_language = code_language if code_language else None
-            
-            tags = MessageTags(
-                topic_tags=topic_tags,
-                tech_keywords=tech_keywords,
-                contains_code=metadata.get('contains_code', False),
-                code_language=code_language
+        # Convert distance to similarity score (cosine similarity)
+        # ChromaDB returns cosine distance, so similarity = 1 - distance
+        similarities = 1.0 - np.asarray(distances, dtype=np.float64)
+        
+        # Filter by similarity threshold, then rank (stable, so ties keep
+        # ChromaDB's order)
+        keep = np.flatnonzero(similarities >= min_similarity)
+        order = keep[np.argsort(-similarities[keep], kind='stable')][:limit]
+        
+        filtered = len(ids) - len(keep)
+        if filtered:
+            logger.debug(
+                f"Filtered {filtered} results below threshold {min_similarity}"
             )
-            
-            # Create SearchResult
-            search_result = SearchResult(
+        
+        # Only the selected top rows are parsed into results; their scores
+        # are converted in one call
+        selected = order.tolist()
+        scores = similarities[order].tolist()
+        
+        for i, similarity_score in zip(selected, scores):
+            metadata = metadatas[i]
+            search_results.append(SearchResult(
                 message_id=ids[i],
                 message_text=documents[i],
                 username=metadata.get('username', 'unknown'),
-                timestamp=timestamp,
+                timestamp=_parse_timestamp(metadata),
                 similarity_score=similarity_score,
-                tags=tags,
+                tags=_parse_tags(metadata),
                 room=metadata.get('room', 'unknown')
-            )
-            
-            search_results.append(search_result)
+            ))
         
         return search_results
@@ -17,7 +17,11 @@ from backend.instant_answer.config import InstantAnswerConfig
 from backend.instant_answer.classifier import MessageClassifier, MessageType, MessageClassification
 from backend.instant_answer.tagger import AutoTagger, MessageTags
 from backend.instant_answer.search_engine import SemanticSearchEngine, SearchResult
-from backend.instant_answer.summary_generator import SummaryGenerator, InstantAnswer
+from backend.instant_answer.summary_generator import (
+    SummaryGenerator,
+    InstantAnswer,
+    SemanticSummaryCache
+)
 from backend.instant_answer.storage import MessageStorageService
 
 logger = logging.getLogger(__name__)
@@ -106,7 +110,9 @@ class InstantAnswerService:
         )
         self.summary_generator = SummaryGenerator(
             gemini_service,
-            config.max_summary_tokens
+            config.max_summary_tokens,
+            summary_cache=SemanticSummaryCache(),
+            embedding_lookup=self.search_engine.cached_embedding
         )
         self.storage_service = MessageStorageService(
             chroma_collection,
@@ -378,12 +384,7 @@ class InstantAnswerService:
                 f"message_preview={message[:50]}"
             )
             # Fallback to empty tags
-            return MessageTags(
-                topic_tags=[],
-                tech_keywords=[],
-                contains_code=False,
-                code_language=None
-            )
+            return MessageTags.EMPTY
     
     async def _store_message_with_fallback(
         self,
@@ -10,19 +10,22 @@ Requirements: 6.1, 6.2, 6.3, 10.5, 8.2
 import logging
 import uuid
 import asyncio
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 from typing import List, Optional
 import chromadb
 
-from backend.instant_answer.classifier import MessageType, MessageClassification
-from backend.instant_answer.tagger import MessageTags
+from backend.instant_answer.classifier import (
+    MESSAGE_TYPE_BY_VALUE,
+    MessageType,
+    MessageClassification
+)
+from backend.instant_answer.tagger import MessageTags, join_tag_string, split_tag_string
 from backend.instant_answer.retry_utils import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+@dataclass(slots=True)
 class StoredMessage:
     """
     Message stored in ChromaDB.
@@ -58,6 +61,28 @@ class StoredMessage:
     contains_code: bool
     code_language: Optional[str]
     embedding: List[float]
+    
+    def to_chroma_metadata(self) -> dict:
+        """
+        Build the ChromaDB metadata dict for this message.
+        
+        ChromaDB only supports str, int, float and bool values, so lists are
+        stored as comma-separated strings and a missing language as "".
+        
+        Returns:
+            Metadata dict ready for collection.add/update
+        """
+        return {
+            "username": self.username,
+            "user_id": self.user_id,
+            "room": self.room,
+            "timestamp": self.timestamp.isoformat(),
+            "message_type": self.message_type.value,
+            "topic_tags": join_tag_string(self.topic_tags),
+            "tech_keywords": join_tag_string(self.tech_keywords),
+            "contains_code": self.contains_code,
+            "code_language": self.code_language or ""
+        }
 
 
 class MessageStorageService:
@@ -132,7 +157,7 @@ class MessageStorageService:
         try:
             # Generate message ID if not provided
             if message_id is None:
-                message_id = f"msg_{uuid.uuid4()}"
+                message_id = f"msg_{uuid.uuid4().hex}"
             
             logger.debug(
                 f"[STORAGE] Starting storage | "
@@ -330,31 +355,42 @@ class MessageStorageService:
         Requirements: 6.4 (from requirements document)
         """
         try:
-            # Retrieve existing message to get other fields
-            existing = self.retrieve_message(message_id)
-            if not existing:
+            # Fetch only the existing metadata (author, room, timestamp);
+            # the old document and embedding are about to be replaced.
+            # ChromaDB calls are synchronous, so run them off the event loop
+            existing = await asyncio.to_thread(
+                self.chroma_collection.get,
+                ids=[message_id],
+                include=["metadatas"]
+            )
+            if not existing or not existing.get('ids'):
                 logger.warning(f"Cannot update non-existent message {message_id}")
                 return False
             
             # Generate new embedding
             embedding = await self._generate_embedding(message_text)
             
-            # Update in ChromaDB (convert lists to strings)
-            self.chroma_collection.update(
+            updated = replace(
+                self._parse_chromadb_result(
+                    message_id=message_id,
+                    document=message_text,
+                    metadata=existing['metadatas'][0],
+                    embedding=embedding
+                ),
+                message_type=classification.message_type,
+                topic_tags=tags.topic_tags,
+                tech_keywords=tags.tech_keywords,
+                contains_code=tags.contains_code,
+                code_language=tags.code_language
+            )
+            
+            # Update in ChromaDB
+            await asyncio.to_thread(
+                self.chroma_collection.update,
                 ids=[message_id],
                 documents=[message_text],
                 embeddings=[embedding],
-                metadatas=[{
-                    "username": existing.username,
-                    "user_id": existing.user_id,
-                    "room": existing.room,
-                    "timestamp": existing.timestamp.isoformat(),
-                    "message_type": classification.message_type.value,
-                    "topic_tags": ",".join(tags.topic_tags) if tags.topic_tags else "",
-                    "tech_keywords": ",".join(tags.tech_keywords) if tags.tech_keywords else "",
-                    "contains_code": tags.contains_code,
-                    "code_language": tags.code_language if tags.code_language else ""
-                }]
+                metadatas=[updated.to_chroma_metadata()]
             )
             
             logger.info(f"Updated message {message_id} in ChromaDB")
@@ -471,19 +507,7 @@ class MessageStorageService:
         Requirements: 6.2, 6.3, 10.5, 8.2
         """
         try:
-            # Prepare metadata (ChromaDB only supports str, int, float, bool)
-            # Convert lists to comma-separated strings
-            metadata = {
-                "username": stored_message.username,
-                "user_id": stored_message.user_id,
-                "room": stored_message.room,
-                "timestamp": stored_message.timestamp.isoformat(),
-                "message_type": stored_message.message_type.value,
-                "topic_tags": ",".join(stored_message.topic_tags) if stored_message.topic_tags else "",
-                "tech_keywords": ",".join(stored_message.tech_keywords) if stored_message.tech_keywords else "",
-                "contains_code": stored_message.contains_code,
-                "code_language": stored_message.code_language if stored_message.code_language else ""
-            }
+            metadata = stored_message.to_chroma_metadata()
             
             # Add to ChromaDB collection with retry (1 retry, 0.5s delay)
             await retry_with_backoff(
@@ -561,18 +585,13 @@ class MessageStorageService:
             timestamp = datetime.now()
         
         # Parse message type
-        message_type_str = metadata.get('message_type', 'discussion')
-        try:
-            message_type = MessageType(message_type_str)
-        except ValueError:
-            message_type = MessageType.DISCUSSION
-        
-        # Parse lists from comma-separated strings
-        topic_tags_str = metadata.get('topic_tags', '')
-        topic_tags = [tag.strip() for tag in topic_tags_str.split(',') if tag.strip()] if topic_tags_str else []
+        message_type = MESSAGE_TYPE_BY_VALUE.get(
+            metadata.get('message_type'), MessageType.DISCUSSION
+        )
         
-        tech_keywords_str = metadata.get('tech_keywords', '')
-        tech_keywords = [kw.strip() for kw in tech_keywords_str.split(',') if kw.strip()] if tech_keywords_str else []
+        # Parse lists from separator-joined strings
+        topic_tags = split_tag_string(metadata.get('topic_tags', ''))
+        tech_keywords = split_tag_string(metadata.get('tech_keywords', ''))
         
         code_language = metadata.get('code_language', '')
         code_language = code_language if code_language else None
@@ -8,17 +8,72 @@ snippets and including source attribution.
 Requirements: 4.2, 4.4, 4.5, 8.1, 8.4
 """
 
+import heapq
 import logging
 import re
-from dataclasses import dataclass
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
 
 from backend.instant_answer.search_engine import SearchResult
 
 logger = logging.getLogger(__name__)
 
+# Code snippet patterns, compiled once for _extract_code_snippets
+_FENCED_CODE_PATTERN = re.compile(r'```[\s\S]*?```')
+_INLINE_CODE_PATTERN = re.compile(r'`[^`]{10,}`')
+
+# Number of top results used for the prompt context and source attribution
+MAX_SOURCES = 5
+_similarity = attrgetter('similarity_score')
+_contains_code = attrgetter('tags.contains_code')
+
+
+@lru_cache(maxsize=256)
+def _format_minute(year: int, month: int, day: int, hour: int, minute: int) -> str:
+    """Format a minute as "%Y-%m-%d %H:%M"; sources often share a minute."""
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}"
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Format a source timestamp for attribution."""
+    return _format_minute(
+        timestamp.year, timestamp.month, timestamp.day, timestamp.hour, timestamp.minute
+    )
+
+# Per-source context entry and the fixed summary prompt, formatted once per call
+_CONTEXT_MESSAGE = "Message {} (by {}, similarity: {:.2f}):\n{}\n".format
+_SUMMARY_PROMPT = """You are helping answer a technical question by summarizing relevant past discussions.
+
+User's Question:
+"{question}"
+
+Relevant Past Messages:
+{context}
+{code_section}
+
+Generate a helpful, coherent summary that:
+1. Directly answers the user's question based on the past messages
+2. Combines insights from multiple sources into a unified response
+3. PRESERVES any code snippets exactly as they appear (use markdown code blocks)
+4. Keeps the response concise (2-3 paragraphs maximum)
+5. Uses a helpful, friendly tone
+6. Focuses on actionable information
+
+Do NOT mention "past messages" or "previous discussions" - write as if you're directly answering.
+Do NOT add phrases like "Based on the search results" - just provide the answer.
+If code snippets are relevant, include them in your response.
+
+Generate the summary now:
+""".format
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InstantAnswer:
     """
     Generated instant answer for a question.
@@ -37,6 +92,119 @@ class InstantAnswer:
     is_novel_question: bool
 
 
+class SemanticSummaryCache:
+    """
+    Cache of generated summaries keyed on question meaning and sources.
+    
+    A cached answer is reused when a new question's embedding is close to a
+    cached question's (cosine similarity at or above ``similarity_threshold``)
+    and the search returned the same source messages with the same text, so
+    the Gemini call is skipped entirely. The summary is a digest of those
+    sources rather than a reply to the question's wording, so a paraphrase
+    that retrieves identical sources gets the same answer. Keying on the
+    message text means an edited source is a miss, never a stale summary.
+    Entries are grouped by source set and evicted least recently used first.
+    """
+    
+    # Maximum questions remembered per source set
+    MAX_QUESTIONS_PER_SOURCES = 8
+    
+    def __init__(self, similarity_threshold: float = 0.9, max_entries: int = 256):
+        """
+        Initialize the cache.
+        
+        Args:
+            similarity_threshold: Minimum cosine similarity between questions
+                for a cached answer to be reused
+            max_entries: Maximum number of distinct source sets kept
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            Tuple[Tuple[str, str], ...], List[Tuple[np.ndarray, InstantAnswer]]
+        ] = OrderedDict()
+    
+    @staticmethod
+    def _source_key(search_results: List[SearchResult]) -> Tuple[Tuple[str, str], ...]:
+        """Identify a result set by its sorted (message ID, message text) pairs."""
+        return tuple(sorted(
+            (result.message_id, result.message_text) for result in search_results
+        ))
+    
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> Optional[np.ndarray]:
+        """Normalize an embedding to unit length (None for a zero vector)."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+    
+    def get(
+        self,
+        question_embedding: np.ndarray,
+        search_results: List[SearchResult]
+    ) -> Optional[InstantAnswer]:
+        """
+        Look up an answer for a similar question over the same sources.
+        
+        Args:
+            question_embedding: Embedding of the incoming question
+            search_results: Search results for the incoming question
+        
+        Returns:
+            The cached answer with the current search results attached, or
+            None on a miss
+        """
+        bucket = self._entries.get(self._source_key(search_results))
+        question = self._unit(question_embedding)
+        if not bucket or question is None:
+            self.misses += 1
+            return None
+        
+        similarities = np.stack([vector for vector, _ in bucket]) @ question
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(self._source_key(search_results))
+        self.hits += 1
+        return replace(bucket[best][1], source_messages=search_results)
+    
+    def put(
+        self,
+        question_embedding: np.ndarray,
+        search_results: List[SearchResult],
+        answer: InstantAnswer
+    ) -> None:
+        """
+        Store a generated answer.
+        
+        Args:
+            question_embedding: Embedding of the question that was answered
+            search_results: Search results the answer was generated from
+            answer: The generated answer
+        """
+        question = self._unit(question_embedding)
+        if question is None or self.max_entries <= 0:
+            return
+        
+        key = self._source_key(search_results)
+        bucket = self._entries.setdefault(key, [])
+        bucket.append((question, answer))
+        del bucket[:-self.MAX_QUESTIONS_PER_SOURCES]
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached answers."""
+        self._entries.clear()
+
+
 class SummaryGenerator:
     """
     Generates AI summaries from search results using Gemini API.
@@ -50,16 +218,27 @@ class SummaryGenerator:
     Requirements: 4.2, 4.4, 4.5
     """
     
-    def __init__(self, gemini_service, max_summary_tokens: int = 300):
+    def __init__(
+        self,
+        gemini_service,
+        max_summary_tokens: int = 300,
+        summary_cache: Optional[SemanticSummaryCache] = None,
+        embedding_lookup: Optional[Callable[[str], Optional[np.ndarray]]] = None
+    ):
         """
         Initialize the summary generator.
         
         Args:
             gemini_service: GeminiService instance for API calls
             max_summary_tokens: Maximum tokens for generated summaries
+            summary_cache: Optional semantic cache of generated answers
+            embedding_lookup: Returns an already computed embedding for a
+                question (or None); required for summary_cache to be used
         """
         self.gemini_service = gemini_service
         self.max_summary_tokens = max_summary_tokens
+        self.summary_cache = summary_cache
+        self.embedding_lookup = embedding_lookup
     
     async def generate_summary(
         self,
@@ -109,6 +288,20 @@ class SummaryGenerator:
                     is_novel_question=True
                 )
             
+            # Reuse an answer to a similar question over the same sources
+            question_embedding = None
+            if self.summary_cache is not None and self.embedding_lookup is not None:
+                question_embedding = self.embedding_lookup(question)
+                if question_embedding is not None:
+                    cached_answer = self.summary_cache.get(question_embedding, search_results)
+                    if cached_answer is not None:
+                        logger.info(
+                            f"[SUMMARY] Served from semantic cache | "
+                            f"confidence={cached_answer.confidence:.3f} "
+                            f"sources={len(search_results)}"
+                        )
+                        return cached_answer
+            
             # Extract code snippets from search results
             code_snippets = self._extract_code_snippets(search_results)
             
@@ -117,8 +310,11 @@ class SummaryGenerator:
                 f"snippets_found={len(code_snippets)}"
             )
             
+            # Select the most similar results once for the prompt and attribution
+            top_results = heapq.nlargest(MAX_SOURCES, search_results, key=_similarity)
+            
             # Create summary prompt
-            prompt = self._create_summary_prompt(question, search_results, code_snippets)
+            prompt = self._create_summary_prompt(question, top_results, code_snippets)
             
             # Call Gemini API with timeout (5 seconds) and retry (2 retries)
             api_start = time.time()
@@ -126,7 +322,8 @@ class SummaryGenerator:
                 prompt,
                 operation="summary_generation",
                 timeout=5.0,
-                max_retries=2
+                max_retries=2,
+                max_output_tokens=self.max_summary_tokens
             )
             api_time = time.time() - api_start
             
@@ -137,7 +334,7 @@ class SummaryGenerator:
             )
             
             # Add source attribution
-            summary_with_sources = self._add_source_attribution(response, search_results)
+            summary_with_sources = self._add_source_attribution(response, top_results)
             
             # Calculate confidence based on search result quality
             confidence = self._calculate_confidence(search_results)
@@ -152,12 +349,17 @@ class SummaryGenerator:
                 f"total_time={total_time:.3f}s"
             )
             
-            return InstantAnswer(
+            answer = InstantAnswer(
                 summary=summary_with_sources,
                 source_messages=search_results,
                 confidence=confidence,
                 is_novel_question=False
             )
+            
+            if question_embedding is not None:
+                self.summary_cache.put(question_embedding, search_results, answer)
+            
+            return answer
         
         except Exception as e:
             total_time = time.time() - start_time
@@ -180,6 +382,9 @@ class SummaryGenerator:
         - Inline code (`...`)
         - Indented code blocks
         
+        Results that repeat an earlier message's text (e.g. a quoted stack
+        trace) are scanned once and contribute their snippets once.
+        
         Args:
             search_results: List of SearchResult objects
         
@@ -189,17 +394,24 @@ class SummaryGenerator:
         Requirements: 4.2
         """
         code_snippets = []
+        find_fenced = _FENCED_CODE_PATTERN.findall
+        find_inline = _INLINE_CODE_PATTERN.findall
+        
+        seen_messages = set()
         
         for result in search_results:
             message = result.message_text
             
+            # Messages without backticks cannot contain either kind of snippet
+            if '`' not in message or message in seen_messages:
+                continue
+            seen_messages.add(message)
+            
             # Extract fenced code blocks
-            fenced_blocks = re.findall(r'```[\s\S]*?```', message)
-            code_snippets.extend(fenced_blocks)
+            code_snippets.extend(find_fenced(message))
             
             # Extract inline code (at least 10 characters to avoid false positives)
-            inline_code = re.findall(r'`[^`]{10,}`', message)
-            code_snippets.extend(inline_code)
+            code_snippets.extend(find_inline(message))
         
         return code_snippets
     
@@ -222,45 +434,18 @@ class SummaryGenerator:
         
         Requirements: 4.2, 4.4
         """
-        # Build context from search results
-        context_messages = []
-        for i, result in enumerate(search_results[:5], 1):  # Limit to top 5
-            context_messages.append(
-                f"Message {i} (by {result.username}, similarity: {result.similarity_score:.2f}):\n"
-                f"{result.message_text}\n"
-            )
-        
-        context = "\n".join(context_messages)
+        # Build context from search results (limit to top 5)
+        context = "\n".join(
+            _CONTEXT_MESSAGE(i, result.username, result.similarity_score, result.message_text)
+            for i, result in enumerate(search_results[:MAX_SOURCES], 1)
+        )
         
         # Build code snippets section
         code_section = ""
         if code_snippets:
             code_section = "\n\nCode snippets found in past answers:\n" + "\n".join(code_snippets[:3])
         
-        prompt = f"""You are helping answer a technical question by summarizing relevant past discussions.
-
-User's Question:
-"{question}"
-
-Relevant Past Messages:
-{context}
-{code_section}
-
-Generate a helpful, coherent summary that:
-1. Directly answers the user's question based on the past messages
-2. Combines insights from multiple sources into a unified response
-3. PRESERVES any code snippets exactly as they appear (use markdown code blocks)
-4. Keeps the response concise (2-3 paragraphs maximum)
-5. Uses a helpful, friendly tone
-6. Focuses on actionable information
-
-Do NOT mention "past messages" or "previous discussions" - write as if you're directly answering.
-Do NOT add phrases like "Based on the search results" - just provide the answer.
-If code snippets are relevant, include them in your response.
-
-Generate the summary now:
-"""
-        return prompt
+        return _SUMMARY_PROMPT(question=question, context=context, code_section=code_section)
     
     def _add_source_attribution(
         self,
@@ -287,8 +472,8 @@ Generate the summary now:
         
         # Build source list
         sources = []
-        for result in search_results[:5]:  # Limit to top 5 sources
-            timestamp_str = result.timestamp.strftime("%Y-%m-%d %H:%M")
+        for result in search_results[:MAX_SOURCES]:  # Limit to top 5 sources
+            timestamp_str = _format_timestamp(result.timestamp)
             sources.append(f"- {result.username} ({timestamp_str})")
         
         source_section = "\n\n---\n**Sources:**\n" + "\n".join(sources)
@@ -314,13 +499,13 @@ Generate the summary now:
             return 0.0
         
         # Average similarity score
-        avg_similarity = sum(r.similarity_score for r in search_results) / len(search_results)
+        avg_similarity = sum(map(_similarity, search_results)) / len(search_results)
         
         # Bonus for multiple results
         result_count_factor = min(len(search_results) / 5.0, 1.0)
         
         # Bonus for code presence
-        has_code = any(r.tags.contains_code for r in search_results)
+        has_code = any(map(_contains_code, search_results))
         code_bonus = 0.1 if has_code else 0.0
         
         # Combine factors
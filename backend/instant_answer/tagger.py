@@ -10,12 +10,46 @@ Requirements: 5.1, 5.2, 5.4, 8.1, 8.4
 import logging
 import re
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import ClassVar, Optional, List, Sequence
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# ChromaDB metadata values must be scalars, so tag lists are stored joined on
+# this separator. AutoTagger splits model output on commas, so individual
+# tags never contain it.
+TAG_SEPARATOR = ","
+
+
+def split_tag_string(value: str) -> List[str]:
+    """
+    Split a TAG_SEPARATOR-joined metadata value back into a list of tags.
+    
+    Args:
+        value: Joined tag string from ChromaDB metadata (may be empty)
+    
+    Returns:
+        List of non-empty, stripped tags
+    """
+    if not value:
+        return []
+    return [tag for tag in map(str.strip, value.split(TAG_SEPARATOR)) if tag]
+
+
+def join_tag_string(tags: Sequence[str]) -> str:
+    """
+    Join a list of tags into a single TAG_SEPARATOR-separated metadata value.
+    
+    Args:
+        tags: Tags to store
+    
+    Returns:
+        Joined tag string (empty if there are no tags)
+    """
+    return TAG_SEPARATOR.join(tags)
+
+
+@dataclass(frozen=True, slots=True)
 class MessageTags:
     """
     Auto-generated tags for a message.
@@ -28,10 +62,16 @@ class MessageTags:
     
     Requirements: 5.1, 5.2, 5.4
     """
-    topic_tags: List[str]
-    tech_keywords: List[str]
+    topic_tags: Sequence[str]
+    tech_keywords: Sequence[str]
     contains_code: bool
     code_language: Optional[str]
+    
+    # Shared instance for messages with no tags (e.g. when tagging fails)
+    EMPTY: ClassVar["MessageTags"]
+
+
+MessageTags.EMPTY = MessageTags(topic_tags=(), tech_keywords=(), contains_code=False, code_language=None)
 
 
 class AutoTagger:
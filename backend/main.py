@@ -146,6 +146,12 @@ async def lifespan(app: FastAPI):
                             print(f"  Messages in ChromaDB: {app.state.chromadb_collection.count()}")
                             print("=" * 60)
                             
+                            # Load the vector index before the first user search;
+                            # keep a reference so the task isn't garbage collected
+                            app.state.search_warmup_task = asyncio.create_task(
+                                app.state.instant_answer_service.search_engine.warmup()
+                            )
+                            
                             # Auto-index historical messages on startup if configured
                             if config.INSTANT_ANSWER_AUTO_INDEX_ON_STARTUP:
                                 print(f"Starting automatic indexing of historical messages from {config.INSTANT_ANSWER_TARGET_ROOM}...")
@@ -214,6 +220,14 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     
+    # Stop the search warmup if it is still running
+    if hasattr(app.state, 'search_warmup_task') and app.state.search_warmup_task:
+        app.state.search_warmup_task.cancel()
+        try:
+            await app.state.search_warmup_task
+        except asyncio.CancelledError:
+            pass
+    
     # Close ChromaDB client
     if hasattr(app.state, 'chromadb_client') and app.state.chromadb_client:
         close_chromadb_client(app.state.chromadb_client)
@@ -3,11 +3,32 @@ Rate limiter for Obsidian BBS.
 
 This module provides rate limiting functionality for messages and commands
 to prevent spam and abuse.
+
+All times are float seconds from time.monotonic(), which is cheaper to read
+and compare than datetime objects and is unaffected by wall-clock changes.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List
-from collections import deque
+import math
+import sys
+import time
+from typing import Deque, List, Optional
+from collections import OrderedDict, deque
+
+
+# How long violations are remembered for abuse escalation (seconds)
+VIOLATION_WINDOW = 60
+
+# User-facing messages. The fixed ones are shared constants; the rest are
+# filled in once per RateLimiter from its configured limits.
+DISCONNECT_MESSAGE = "You have been disconnected for persistent rate limit violations."
+MUTED_MESSAGE = "You are temporarily muted. {} seconds remaining.".format
+MUTE_APPLIED_TEMPLATE = "Rate limit exceeded. You have been muted for {mute_duration} seconds."
+MESSAGE_WARNING_TEMPLATE = (
+    "Warning: Rate limit exceeded. Maximum {limit} messages per {window} seconds. "
+    "Repeated violations will result in a temporary mute."
+)
+MESSAGE_LIMIT_TEMPLATE = "Rate limit exceeded. Maximum {limit} messages per {window} seconds."
+COMMAND_LIMIT_TEMPLATE = "Command rate limit exceeded. Maximum {limit} commands per {window} seconds."
 
 
 class RateLimitViolation:
@@ -17,13 +38,13 @@ class RateLimitViolation:
     Attributes:
         username: Username that violated the limit
         violation_type: Type of violation ('message' or 'command')
-        timestamp: When the violation occurred
+        timestamp: When the violation occurred (monotonic seconds)
     """
     
-    def __init__(self, username: str, violation_type: str):
+    def __init__(self, username: str, violation_type: str, timestamp: Optional[float] = None):
         self.username = username
         self.violation_type = violation_type
-        self.timestamp = datetime.utcnow()
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
 
 
 class UserRateLimitState:
@@ -32,87 +53,162 @@ class UserRateLimitState:
     
     Attributes:
         username: Username being tracked
-        message_timestamps: Deque of recent message timestamps
-        command_timestamps: Deque of recent command timestamps
-        violations: List of rate limit violations
-        muted_until: Timestamp when temporary mute expires (None if not muted)
+        message_timestamps: Deque of recent message timestamps (at most message_limit)
+        command_timestamps: Deque of recent command timestamps (at most command_limit)
+        violations: Deque of violations from the last VIOLATION_WINDOW seconds,
+            oldest first
+        muted_until: Monotonic time when temporary mute expires (0.0 if never
+            muted; a past value means the mute has expired)
         warning_sent: Whether a warning has been sent for current violation
+        last_seen: Monotonic time the limiter last checked this user
     """
     
-    def __init__(self, username: str):
+    def __init__(self, username: str, message_limit: int = 10, command_limit: int = 5):
         self.username = username
-        self.message_timestamps: deque = deque()
-        self.command_timestamps: deque = deque()
-        self.violations: List[RateLimitViolation] = []
-        self.muted_until: datetime = None
+        # A timestamp is only recorded when the action is allowed, so the
+        # windows never need more than `limit` entries
+        self.message_timestamps: deque = deque(maxlen=message_limit)
+        self.command_timestamps: deque = deque(maxlen=command_limit)
+        self.violations: Deque[RateLimitViolation] = deque()
+        self.muted_until: float = 0.0
         self.warning_sent: bool = False
+        self.last_seen: float = time.monotonic()
     
-    def is_muted(self) -> bool:
+    def reset(self, username: str) -> None:
+        """
+        Clear all tracked state and reassign the state to a new user.
+        
+        Used by RateLimiter to recycle state objects instead of allocating
+        new ones for every connection.
+        
+        Args:
+            username: Username the state will track from now on
+        """
+        self.username = username
+        self.message_timestamps.clear()
+        self.command_timestamps.clear()
+        self.violations.clear()
+        self.muted_until = 0.0
+        self.warning_sent = False
+        self.last_seen = time.monotonic()
+    
+    def is_muted(self, now: Optional[float] = None) -> bool:
         """
         Check if user is currently muted.
         
+        Args:
+            now: Current monotonic time (read from the clock if omitted)
+        
         Returns:
             True if user is muted, False otherwise
         """
-        if self.muted_until is None:
-            return False
-        
-        if datetime.utcnow() >= self.muted_until:
-            # Mute has expired
-            self.muted_until = None
-            self.warning_sent = False
-            return False
-        
-        return True
+        return (time.monotonic() if now is None else now) < self.muted_until
     
-    def add_message_timestamp(self) -> None:
+    def add_message_timestamp(self, now: Optional[float] = None) -> None:
         """Add a timestamp for a message."""
-        self.message_timestamps.append(datetime.utcnow())
+        self.message_timestamps.append(time.monotonic() if now is None else now)
     
-    def add_command_timestamp(self) -> None:
+    def add_command_timestamp(self, now: Optional[float] = None) -> None:
         """Add a timestamp for a command."""
-        self.command_timestamps.append(datetime.utcnow())
+        self.command_timestamps.append(time.monotonic() if now is None else now)
     
-    def add_violation(self, violation_type: str) -> None:
+    def add_violation(self, violation_type: str, now: Optional[float] = None) -> None:
         """
         Record a rate limit violation.
         
         Args:
             violation_type: Type of violation ('message' or 'command')
+            now: Current monotonic time (read from the clock if omitted)
         """
-        violation = RateLimitViolation(self.username, violation_type)
+        violation = RateLimitViolation(self.username, violation_type, now)
         self.violations.append(violation)
+        
+        # Drop violations that can no longer count towards escalation so the
+        # deque stays bounded by the abuse rate rather than session length
+        cutoff = violation.timestamp - VIOLATION_WINDOW
+        while self.violations[0].timestamp < cutoff:
+            self.violations.popleft()
     
-    def get_recent_violations(self, seconds: int = 60) -> List[RateLimitViolation]:
+    def get_recent_violations(
+        self,
+        seconds: int = 60,
+        now: Optional[float] = None
+    ) -> List[RateLimitViolation]:
         """
         Get violations within the last N seconds.
         
+        Violations older than VIOLATION_WINDOW are discarded when new ones
+        are recorded, so larger windows are capped at that value.
+        
         Args:
             seconds: Time window to check (default: 60 seconds)
+            now: Current monotonic time (read from the clock if omitted)
             
         Returns:
-            List of recent violations
+            List of recent violations, oldest first
         """
-        cutoff = datetime.utcnow() - timedelta(seconds=seconds)
-        return [v for v in self.violations if v.timestamp >= cutoff]
+        cutoff = (time.monotonic() if now is None else now) - seconds
+        
+        # Walk back from the newest violation and stop at the window edge
+        recent = []
+        for violation in reversed(self.violations):
+            if violation.timestamp < cutoff:
+                break
+            recent.append(violation)
+        recent.reverse()
+        return recent
     
-    def clean_old_timestamps(self, message_window: int = 10, command_window: int = 5) -> None:
+    def count_recent_violations(
+        self,
+        seconds: int = 60,
+        violation_type: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> int:
+        """
+        Count violations within the last N seconds without building a list.
+        
+        Args:
+            seconds: Time window to check (default: 60 seconds)
+            violation_type: Only count violations of this type if given
+            now: Current monotonic time (read from the clock if omitted)
+            
+        Returns:
+            Number of recent violations
+        """
+        cutoff = (time.monotonic() if now is None else now) - seconds
+        
+        count = 0
+        for violation in reversed(self.violations):
+            if violation.timestamp < cutoff:
+                break
+            if violation_type is None or violation.violation_type == violation_type:
+                count += 1
+        return count
+    
+    def clean_old_timestamps(
+        self,
+        message_window: int = 10,
+        command_window: int = 5,
+        now: Optional[float] = None
+    ) -> None:
         """
         Remove timestamps outside the rate limit windows.
         
         Args:
             message_window: Message rate limit window in seconds (default: 10)
             command_window: Command rate limit window in seconds (default: 5)
+            now: Current monotonic time (read from the clock if omitted)
         """
-        now = datetime.utcnow()
+        if now is None:
+            now = time.monotonic()
         
         # Clean message timestamps
-        message_cutoff = now - timedelta(seconds=message_window)
+        message_cutoff = now - message_window
         while self.message_timestamps and self.message_timestamps[0] < message_cutoff:
             self.message_timestamps.popleft()
         
         # Clean command timestamps
-        command_cutoff = now - timedelta(seconds=command_window)
+        command_cutoff = now - command_window
         while self.command_timestamps and self.command_timestamps[0] < command_cutoff:
             self.command_timestamps.popleft()
 
@@ -128,22 +224,37 @@ class RateLimiter:
     - Temporary mute (30 seconds) on repeated violations
     - Disconnect recommendation on persistent abuse
     
+    User states are kept in least-recently-checked order. States idle for
+    longer than state_ttl are dropped when a new user is added, and the
+    least recently checked state is evicted once max_users is reached, so
+    memory stays bounded even if disconnect cleanup is missed.
+    
+    The limiter is not thread-safe and takes no locks. It is only called
+    from WebSocket handlers on the server's single asyncio event loop, and
+    no method awaits, so each check runs to completion without interleaving.
+    
     Attributes:
-        user_states: Dict mapping username to UserRateLimitState
+        user_states: OrderedDict mapping username to UserRateLimitState (LRU order)
         message_limit: Maximum messages per window
         message_window: Time window for message limit (seconds)
         command_limit: Maximum commands per window
         command_window: Time window for command limit (seconds)
         mute_duration: Duration of temporary mute (seconds)
+        max_users: Maximum number of user states kept
+        state_ttl: Idle seconds after which a user state may be dropped
     """
     
+    # Upper bound on released states kept around for reuse
+    MAX_FREE_STATES = 1024
+    
     def __init__(
         self,
         message_limit: int = 10,
         message_window: int = 10,
         command_limit: int = 5,
         command_window: int = 5,
-        mute_duration: int = 30
+        mute_duration: int = 30,
+        max_users: int = 10000
     ):
         """
         Initialize the rate limiter.
@@ -154,34 +265,111 @@ class RateLimiter:
             command_limit: Maximum commands per window (default: 5)
             command_window: Command window in seconds (default: 5)
             mute_duration: Mute duration in seconds (default: 30)
+            max_users: Maximum number of user states kept (default: 10000)
         """
-        self.user_states: Dict[str, UserRateLimitState] = {}
+        self.user_states: OrderedDict[str, UserRateLimitState] = OrderedDict()
         self.message_limit = message_limit
         self.message_window = message_window
         self.command_limit = command_limit
         self.command_window = command_window
         self.mute_duration = mute_duration
+        self.max_users = max_users
+        
+        # An idle state can only be dropped once nothing in it still matters:
+        # rate windows, mutes and the violation escalation window have all passed
+        self.state_ttl = 2 * max(message_window, command_window, mute_duration, VIOLATION_WINDOW)
+        
+        # Released states, reused by _get_user_state for new users
+        self._free_states: List[UserRateLimitState] = []
+        
+        # Rejection messages only depend on the limits, so build them once
+        self._mute_applied_message = MUTE_APPLIED_TEMPLATE.format(mute_duration=mute_duration)
+        self._message_warning = MESSAGE_WARNING_TEMPLATE.format(
+            limit=message_limit, window=message_window
+        )
+        self._message_limit_message = MESSAGE_LIMIT_TEMPLATE.format(
+            limit=message_limit, window=message_window
+        )
+        self._command_limit_message = COMMAND_LIMIT_TEMPLATE.format(
+            limit=command_limit, window=command_window
+        )
     
-    def _get_user_state(self, username: str) -> UserRateLimitState:
+    def _get_user_state(self, username: str, now: Optional[float] = None) -> UserRateLimitState:
         """
         Get or create user rate limit state.
         
         Args:
             username: Username to get state for
+            now: Current monotonic time (read from the clock if omitted)
             
         Returns:
             UserRateLimitState for the user
         """
-        if username not in self.user_states:
-            self.user_states[username] = UserRateLimitState(username)
-        return self.user_states[username]
+        if now is None:
+            now = time.monotonic()
+        user_states = self.user_states
+        state = user_states.get(username)
+        
+        if state is not None:
+            user_states.move_to_end(username)
+        else:
+            self._evict_idle_states(now)
+            while len(user_states) >= self.max_users:
+                self._release_state(user_states.popitem(last=False)[1])
+            
+            if self._free_states:
+                state = self._free_states.pop()
+                state.reset(username)
+            else:
+                state = UserRateLimitState(username, self.message_limit, self.command_limit)
+            user_states[sys.intern(username)] = state
+        
+        state.last_seen = now
+        return state
+    
+    def _evict_idle_states(self, now: float) -> None:
+        """
+        Drop states that have been idle for longer than state_ttl.
+        
+        States are in least-recently-checked order, so this stops at the
+        first state that is still fresh.
+        
+        Args:
+            now: Current monotonic time
+        """
+        cutoff = now - self.state_ttl
+        while self.user_states:
+            oldest = next(iter(self.user_states.values()))
+            if oldest.last_seen >= cutoff:
+                break
+            self._release_state(self.user_states.popitem(last=False)[1])
+    
+    def _release_state(self, state: UserRateLimitState) -> None:
+        """
+        Return a removed user state to the free list for reuse.
+        
+        The state is cleared when it is handed out again, not here.
+        
+        Args:
+            state: State that is no longer in user_states
+        """
+        if len(self._free_states) < self.MAX_FREE_STATES:
+            self._free_states.append(state)
     
-    def check_message_limit(self, username: str) -> tuple[bool, str, bool]:
+    def check_message_limit(
+        self,
+        username: str,
+        now: Optional[float] = None
+    ) -> tuple[bool, str, bool]:
         """
         Check if user can send a message.
         
+        The clock is read once per call and the same value is used for the
+        mute check, window trimming and any recorded timestamp.
+        
         Args:
             username: Username to check
+            now: Current monotonic time (read from the clock if omitted)
             
         Returns:
             Tuple of (allowed, message, should_disconnect)
@@ -189,45 +377,57 @@ class RateLimiter:
             - message: Error/warning message if not allowed, empty string if allowed
             - should_disconnect: True if user should be disconnected for persistent abuse
         """
-        state = self._get_user_state(username)
+        if now is None:
+            now = time.monotonic()
+        state = self._get_user_state(username, now)
         
-        # Check if user is muted
-        if state.is_muted():
-            remaining = (state.muted_until - datetime.utcnow()).total_seconds()
-            return (
-                False,
-                f"You are temporarily muted. {int(remaining)} seconds remaining.",
-                False
-            )
+        # Check if user is muted (most users never are, so one float test)
+        muted_until = state.muted_until
+        if muted_until:
+            if now < muted_until:
+                # Round up so a fresh mute reports its full duration
+                remaining = math.ceil(muted_until - now)
+                return (
+                    False,
+                    MUTED_MESSAGE(remaining),
+                    False
+                )
+            
+            # Mute has expired; the next violation starts with a fresh warning
+            state.muted_until = 0.0
+            state.warning_sent = False
         
-        # Clean old timestamps
-        state.clean_old_timestamps(self.message_window, self.command_window)
+        # Drop message timestamps outside the window
+        timestamps = state.message_timestamps
+        cutoff = now - self.message_window
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
         
         # Check if within limit
-        if len(state.message_timestamps) < self.message_limit:
+        if len(timestamps) < self.message_limit:
             # Within limit, allow message
-            state.add_message_timestamp()
+            timestamps.append(now)
             return (True, "", False)
         
         # Rate limit exceeded
-        state.add_violation('message')
-        recent_violations = state.get_recent_violations(seconds=60)
+        state.add_violation('message', now)
+        recent_violations = state.count_recent_violations(VIOLATION_WINDOW, now=now)
         
         # Check for persistent abuse (3+ violations in last 60 seconds)
-        if len(recent_violations) >= 3:
+        if recent_violations >= 3:
             return (
                 False,
-                "You have been disconnected for persistent rate limit violations.",
+                DISCONNECT_MESSAGE,
                 True
             )
         
         # Check for repeated violations (2+ violations)
-        if len(recent_violations) >= 2:
+        if recent_violations >= 2:
             # Apply temporary mute
-            state.muted_until = datetime.utcnow() + timedelta(seconds=self.mute_duration)
+            state.muted_until = now + self.mute_duration
             return (
                 False,
-                f"Rate limit exceeded. You have been muted for {self.mute_duration} seconds.",
+                self._mute_applied_message,
                 False
             )
         
@@ -236,23 +436,52 @@ class RateLimiter:
             state.warning_sent = True
             return (
                 False,
-                f"Warning: Rate limit exceeded. Maximum {self.message_limit} messages per {self.message_window} seconds. Repeated violations will result in a temporary mute.",
+                self._message_warning,
                 False
             )
         
         # Subsequent violations before mute
         return (
             False,
-            f"Rate limit exceeded. Maximum {self.message_limit} messages per {self.message_window} seconds.",
+            self._message_limit_message,
             False
         )
     
-    def check_command_limit(self, username: str) -> tuple[bool, str, bool]:
+    def check_message_limit_bulk(
+        self,
+        usernames: List[str],
+        now: Optional[float] = None
+    ) -> List[tuple[bool, str, bool]]:
+        """
+        Check the message limit for several users at once.
+        
+        The clock is read once and shared by every check, so results are
+        identical to calling check_message_limit for each user at the same
+        instant.
+        
+        Args:
+            usernames: Usernames to check, in order
+            now: Current monotonic time (read from the clock if omitted)
+        
+        Returns:
+            List of (allowed, message, should_disconnect) tuples, one per username
+        """
+        if now is None:
+            now = time.monotonic()
+        check = self.check_message_limit
+        return [check(username, now) for username in usernames]
+    
+    def check_command_limit(
+        self,
+        username: str,
+        now: Optional[float] = None
+    ) -> tuple[bool, str, bool]:
         """
         Check if user can execute a command.
         
         Args:
             username: Username to check
+            now: Current monotonic time (read from the clock if omitted)
             
         Returns:
             Tuple of (allowed, message, should_disconnect)
@@ -260,35 +489,40 @@ class RateLimiter:
             - message: Error message if not allowed, empty string if allowed
             - should_disconnect: True if user should be disconnected for persistent abuse
         """
-        state = self._get_user_state(username)
+        if now is None:
+            now = time.monotonic()
+        state = self._get_user_state(username, now)
         
         # Commands are not blocked by mute, but still rate limited
         
-        # Clean old timestamps
-        state.clean_old_timestamps(self.message_window, self.command_window)
+        # Drop command timestamps outside the window
+        timestamps = state.command_timestamps
+        cutoff = now - self.command_window
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
         
         # Check if within limit
-        if len(state.command_timestamps) < self.command_limit:
+        if len(timestamps) < self.command_limit:
             # Within limit, allow command
-            state.add_command_timestamp()
+            timestamps.append(now)
             return (True, "", False)
         
         # Rate limit exceeded
-        state.add_violation('command')
-        recent_violations = state.get_recent_violations(seconds=60)
+        state.add_violation('command', now)
+        recent_violations = state.count_recent_violations(VIOLATION_WINDOW, now=now)
         
         # Check for persistent abuse (3+ violations in last 60 seconds)
-        if len(recent_violations) >= 3:
+        if recent_violations >= 3:
             return (
                 False,
-                "You have been disconnected for persistent rate limit violations.",
+                DISCONNECT_MESSAGE,
                 True
             )
         
         # For commands, just send error and ignore
         return (
             False,
-            f"Command rate limit exceeded. Maximum {self.command_limit} commands per {self.command_window} seconds.",
+            self._command_limit_message,
             False
         )
     
@@ -299,8 +533,9 @@ class RateLimiter:
         Args:
             username: Username to reset
         """
-        if username in self.user_states:
-            del self.user_states[username]
+        state = self.user_states.pop(username, None)
+        if state is not None:
+            self._release_state(state)
     
     def cleanup_inactive_users(self, active_usernames: List[str]) -> None:
         """
@@ -309,10 +544,11 @@ class RateLimiter:
         Args:
             active_usernames: List of currently active usernames
         """
+        active = set(active_usernames)
         inactive_users = [
-            username for username in self.user_states.keys()
-            if username not in active_usernames
+            username for username in self.user_states
+            if username not in active
         ]
         
         for username in inactive_users:
-            del self.user_states[username]
+            self._release_state(self.user_states.pop(username))
@@ -4,8 +4,9 @@ Room models for Obsidian BBS.
 This module defines the Room data structure for managing chat rooms.
 """
 
-from datetime import datetime
-from typing import Set, List, Dict, Any
+import sys
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from collections import deque
 
 
@@ -16,12 +17,20 @@ class Room:
     Attributes:
         name: Unique room name
         description: Room description
-        created_at: Timestamp when room was created
-        users: Set of usernames currently in the room
+        created_at: Time the room was created (epoch seconds)
+        users: Dict mapping usernames currently in the room to their join
+            time (epoch seconds), in join order. Mutate through
+            add_user/remove_user so the cached snapshot stays valid.
         message_history: Recent message history (last 50 messages)
     """
     
-    def __init__(self, name: str, description: str, max_history: int = 50):
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        max_history: int = 50,
+        created_at: Optional[float] = None
+    ):
         """
         Initialize a new room.
         
@@ -29,12 +38,56 @@ class Room:
             name: Room name
             description: Room description
             max_history: Maximum number of messages to keep in history
+            created_at: Creation time in epoch seconds (defaults to now)
         """
-        self.name = name
+        # Room names are dict keys across services; interning lets lookups
+        # short-circuit on identity
+        self.name = sys.intern(name)
         self.description = description
-        self.created_at = datetime.utcnow()
-        self.users: Set[str] = set()
+        self.created_at = time.time() if created_at is None else created_at
+        self.users: Dict[str, float] = {}
         self.message_history: deque = deque(maxlen=max_history)
+        # Cached tuple of users, rebuilt lazily after membership changes
+        self._users_snapshot: Optional[Tuple[str, ...]] = None
+    
+    def add_user(self, username: str) -> None:
+        """
+        Add a user to the room.
+        
+        Args:
+            username: Username joining the room
+        """
+        if username not in self.users:
+            self.users[username] = time.time()
+            self._users_snapshot = None
+    
+    def remove_user(self, username: str) -> bool:
+        """
+        Remove a user from the room.
+        
+        Args:
+            username: Username leaving the room
+        
+        Returns:
+            True if the user was in the room, False otherwise
+        """
+        if self.users.pop(username, None) is None:
+            return False
+        self._users_snapshot = None
+        return True
+    
+    def get_users(self) -> Tuple[str, ...]:
+        """
+        Get an immutable snapshot of the users in the room.
+        
+        The same tuple is returned until membership changes.
+        
+        Returns:
+            Tuple of usernames in the room, in join order
+        """
+        if self._users_snapshot is None:
+            self._users_snapshot = tuple(self.users)
+        return self._users_snapshot
     
     def add_message(self, message: Dict[str, Any]) -> None:
         """
@@ -7,6 +7,8 @@ This module provides room management functionality including:
 - Room state management
 """
 
+import sys
+import time
 from typing import Dict, List, Optional, Set
 from backend.rooms.models import Room
 from backend.database import User
@@ -23,11 +25,21 @@ class RoomService:
     - Room member queries
     """
     
+    # (name, description) for the rooms every BBS instance starts with
+    DEFAULT_ROOMS = (
+        ("Lobby", "Main gathering space - Welcome to Obsidian!"),
+        ("Techline", "Technology and programming discussions"),
+        ("Arcade Hall", "Play retro games (Snake, Tetris, Breakout)"),
+        ("Support", "Private space for emotional support and listening")
+    )
+    
     def __init__(self):
         """
         Initialize the room service with empty room dictionary.
         """
         self.rooms: Dict[str, Room] = {}
+        # Reverse index of username -> room most recently joined
+        self._user_rooms: Dict[str, str] = {}
     
     def create_default_rooms(self) -> None:
         """
@@ -39,18 +51,17 @@ class RoomService:
         - Arcade Hall: Gaming and entertainment
         - Support: Empathetic support bot for emotional support
         
-        This method is idempotent - calling it multiple times won't create duplicates.
+        This method is idempotent - calling it multiple times won't create duplicates,
+        and rooms that already exist are not rebuilt.
         """
-        default_rooms = [
-            ("Lobby", "Main gathering space - Welcome to Obsidian!"),
-            ("Techline", "Technology and programming discussions"),
-            ("Arcade Hall", "Play retro games (Snake, Tetris, Breakout)"),
-            ("Support", "Private space for emotional support and listening")
-        ]
-        
-        for name, description in default_rooms:
+        created_at = time.time()
+        for name, description in self.DEFAULT_ROOMS:
             if name not in self.rooms:
-                self.rooms[name] = Room(name=name, description=description)
+                self.rooms[name] = Room(
+                    name=name,
+                    description=description,
+                    created_at=created_at
+                )
     
     def get_rooms(self) -> List[Room]:
         """
@@ -88,7 +99,9 @@ class RoomService:
         if not room:
             return False
         
-        room.users.add(user.username)
+        username = sys.intern(user.username)
+        room.add_user(username)
+        self._user_rooms[username] = room.name
         return True
     
     def leave_room(self, user: User, room_name: str) -> bool:
@@ -106,8 +119,9 @@ class RoomService:
         if not room:
             return False
         
-        if user.username in room.users:
-            room.users.remove(user.username)
+        if room.remove_user(user.username):
+            if self._user_rooms.get(user.username) == room_name:
+                del self._user_rooms[user.username]
             return True
         
         return False
@@ -126,7 +140,7 @@ class RoomService:
         if not room:
             return []
         
-        return list(room.users)
+        return list(room.get_users())
     
     def get_room_count(self, room_name: str) -> int:
         """
@@ -154,11 +168,18 @@ class RoomService:
         Returns:
             Room name if user is found, None otherwise
         """
-        for room in self.rooms.values():
-            if username in room.users:
-                return room.name
+        room_name = self._user_rooms.get(username)
+        if room_name is None:
+            return None
+        
+        # Rooms can be deleted directly from self.rooms (e.g. support rooms),
+        # so confirm the indexed room still exists and still holds the user
+        room = self.rooms.get(room_name)
+        if room is None or username not in room.users:
+            del self._user_rooms[username]
+            return None
         
-        return None
+        return room_name
     
     def move_user(self, user: User, from_room: str, to_room: str) -> bool:
         """
@@ -9,14 +9,93 @@ Requirements: 4.1, 4.2, 4.3, 4.4, 4.5, 5.1, 5.2, 5.3, 5.4, 5.5, 9.1, 9.2, 9.3
 """
 
 import logging
+import random
 from typing import List, Dict, Any, Optional
-from backend.support.sentiment import SentimentResult, CrisisType
+from backend.support.sentiment import SentimentResult, EmotionType, CrisisType
 from backend.support.hotlines import CrisisHotlineService
 from backend.vecna.gemini_service import GeminiService, GeminiServiceError
 from backend.vecna.user_profile import UserProfile
 
 logger = logging.getLogger(__name__)
 
+_EMOTION_DESCRIPTIONS = {
+    "sadness": "sadness or distress",
+    "anger": "anger or frustration",
+    "frustration": "frustration or feeling stuck",
+    "anxiety": "anxiety or worry"
+}
+
+_FALLBACK_GREETING_CLOSING = " While I'm an AI and not a therapist, I genuinely care and want to understand what's on your mind. What's been happening?"
+
+# Complete fallback greetings per emotion, so a failed API call is one lookup
+_FALLBACK_GREETINGS = {
+    EmotionType.SADNESS: "I noticed you might be feeling down. I'm here to listen and support you." + _FALLBACK_GREETING_CLOSING,
+    EmotionType.ANGER: "I can see you're feeling frustrated or upset. I'm here to listen without judgment." + _FALLBACK_GREETING_CLOSING,
+    EmotionType.FRUSTRATION: "It sounds like things are feeling difficult right now. I'm here to support you." + _FALLBACK_GREETING_CLOSING,
+    EmotionType.ANXIETY: "I noticed you might be feeling worried or anxious. I'm here to listen and help if I can." + _FALLBACK_GREETING_CLOSING
+}
+
+_DEFAULT_FALLBACK_GREETING = "I'm here to listen and support you." + _FALLBACK_GREETING_CLOSING
+
+_FALLBACK_RESPONSES = (
+    "I hear you, and I want to understand better. Can you tell me more about what's going on?",
+    "That sounds really difficult. What part of this feels most challenging for you right now?",
+    "I'm listening. How are you feeling about all of this?",
+    "Thank you for sharing that with me. What would feel most helpful to you right now?"
+)
+
+# Static instruction blocks appended to every prompt; built once at import
+# rather than re-rendered inside each f-string.
+_GREETING_INSTRUCTIONS = """Generate a warm, empathetic greeting that:
+1. Acknowledges you noticed they might be going through something difficult
+2. Expresses genuine care and willingness to listen
+3. Sets appropriate expectations (you're an AI assistant, not a therapist)
+4. Asks an open-ended question to encourage them to share
+5. Uses warm, non-judgmental language
+6. Keeps it concise (2-3 sentences)
+
+IMPORTANT BOUNDARIES:
+- Do NOT diagnose mental health conditions
+- Do NOT claim to be a therapist or mental health professional
+- Do NOT use clinical/diagnostic language
+- DO be warm, curious, and supportive
+- DO ask open-ended questions
+- DO validate their feelings
+
+Example tone: "I noticed you might be going through something difficult right now. I'm here to listen and support you - while I'm an AI and not a therapist, I genuinely care and want to understand what's on your mind. What's been happening?"
+"""
+
+_EMPATHETIC_INSTRUCTIONS = """Generate an empathetic, supportive response that:
+1. Demonstrates curiosity about their situation
+2. Expresses genuine empathy for their emotional state
+3. Uses warm, non-judgmental language
+4. Asks at least one open-ended question to encourage sharing
+5. Validates their feelings without dismissing them
+6. Provides practical, actionable advice if appropriate (within AI limitations)
+7. Keeps it concise (2-4 sentences)
+
+CRITICAL BOUNDARIES:
+- NEVER diagnose mental health conditions (no "depression", "anxiety disorder", "PTSD", etc.)
+- NEVER claim to be a therapist or mental health professional
+- NEVER use clinical/diagnostic terminology
+- NEVER provide medical advice
+- DO be warm, curious, and supportive
+- DO ask open-ended questions
+- DO validate their feelings
+- DO suggest general coping strategies (breathing, talking to someone, taking breaks)
+- DO acknowledge your limitations as an AI
+
+Example good responses:
+- "That sounds really difficult. It makes sense you'd feel overwhelmed by all of that. What part feels most challenging right now?"
+- "I hear you, and those feelings are valid. Sometimes when things feel heavy, it can help to talk to someone you trust. Is there anyone in your life you feel comfortable opening up to?"
+- "It sounds like you're carrying a lot right now. Have you had a chance to take a break or do something that usually helps you feel a bit better?"
+
+Example BAD responses (avoid these):
+- "It sounds like you might have depression." (diagnosis)
+- "As a therapist, I recommend..." (false claim)
+- "You should try cognitive behavioral therapy." (clinical advice)
+"""
+
 
 class SupportBot:
     """
@@ -56,6 +135,9 @@ class SupportBot:
         self.gemini = gemini_service
         self.hotline_service = CrisisHotlineService()
         self.bot_name = "Support Bot"
+        
+        # Formatted hotline messages per crisis type; the hotlines are fixed
+        self._crisis_responses: Dict[CrisisType, str] = {}
     
     async def generate_greeting(
         self,
@@ -87,7 +169,8 @@ class SupportBot:
             response = await self.gemini._generate_content(
                 prompt,
                 operation="support_greeting",
-                user_id=user_profile.user_id
+                user_id=user_profile.user_id,
+                use_cache=False
             )
             
             logger.info(f"Generated support greeting for user {user_profile.user_id}")
@@ -132,7 +215,8 @@ class SupportBot:
             response = await self.gemini._generate_content(
                 prompt,
                 operation="support_response",
-                user_id=user_profile.user_id
+                user_id=user_profile.user_id,
+                use_cache=False
             )
             
             logger.info(f"Generated support response for user {user_profile.user_id}")
@@ -157,7 +241,11 @@ class SupportBot:
             
         Requirements: 5.4, 7.3, 7.4, 7.5
         """
-        return self.hotline_service.format_hotline_message(crisis_type)
+        response = self._crisis_responses.get(crisis_type)
+        if response is None:
+            response = self.hotline_service.format_hotline_message(crisis_type)
+            self._crisis_responses[crisis_type] = response
+        return response
     
     def _create_greeting_prompt(
         self,
@@ -183,14 +271,7 @@ class SupportBot:
         frequent_rooms = list(user_profile.frequent_rooms.keys())[:3] if user_profile.frequent_rooms else []
         recent_rooms = user_profile.recent_rooms[:5] if user_profile.recent_rooms else []
         
-        emotion_descriptions = {
-            "sadness": "sadness or distress",
-            "anger": "anger or frustration",
-            "frustration": "frustration or feeling stuck",
-            "anxiety": "anxiety or worry"
-        }
-        
-        emotion_desc = emotion_descriptions.get(
+        emotion_desc = _EMOTION_DESCRIPTIONS.get(
             sentiment.emotion.value,
             "emotional distress"
         )
@@ -203,24 +284,8 @@ User Context:
 - Recent room activity: {', '.join(recent_rooms) if recent_rooms else 'Unknown'}
 - Trigger message: "{trigger_message}"
 
-Generate a warm, empathetic greeting that:
-1. Acknowledges you noticed they might be going through something difficult
-2. Expresses genuine care and willingness to listen
-3. Sets appropriate expectations (you're an AI assistant, not a therapist)
-4. Asks an open-ended question to encourage them to share
-5. Uses warm, non-judgmental language
-6. Keeps it concise (2-3 sentences)
-
-IMPORTANT BOUNDARIES:
-- Do NOT diagnose mental health conditions
-- Do NOT claim to be a therapist or mental health professional
-- Do NOT use clinical/diagnostic language
-- DO be warm, curious, and supportive
-- DO ask open-ended questions
-- DO validate their feelings
-
-Example tone: "I noticed you might be going through something difficult right now. I'm here to listen and support you - while I'm an AI and not a therapist, I genuinely care and want to understand what's on your mind. What's been happening?"
 """
+        prompt += _GREETING_INSTRUCTIONS
         
         return prompt
     
@@ -271,36 +336,8 @@ Conversation History:
 
 User's Current Message: "{user_message}"
 
-Generate an empathetic, supportive response that:
-1. Demonstrates curiosity about their situation
-2. Expresses genuine empathy for their emotional state
-3. Uses warm, non-judgmental language
-4. Asks at least one open-ended question to encourage sharing
-5. Validates their feelings without dismissing them
-6. Provides practical, actionable advice if appropriate (within AI limitations)
-7. Keeps it concise (2-4 sentences)
-
-CRITICAL BOUNDARIES:
-- NEVER diagnose mental health conditions (no "depression", "anxiety disorder", "PTSD", etc.)
-- NEVER claim to be a therapist or mental health professional
-- NEVER use clinical/diagnostic terminology
-- NEVER provide medical advice
-- DO be warm, curious, and supportive
-- DO ask open-ended questions
-- DO validate their feelings
-- DO suggest general coping strategies (breathing, talking to someone, taking breaks)
-- DO acknowledge your limitations as an AI
-
-Example good responses:
-- "That sounds really difficult. It makes sense you'd feel overwhelmed by all of that. What part feels most challenging right now?"
-- "I hear you, and those feelings are valid. Sometimes when things feel heavy, it can help to talk to someone you trust. Is there anyone in your life you feel comfortable opening up to?"
-- "It sounds like you're carrying a lot right now. Have you had a chance to take a break or do something that usually helps you feel a bit better?"
-
-Example BAD responses (avoid these):
-- "It sounds like you might have depression." (diagnosis)
-- "As a therapist, I recommend..." (false claim)
-- "You should try cognitive behavioral therapy." (clinical advice)
 """
+        prompt += _EMPATHETIC_INSTRUCTIONS
         
         return prompt
     
@@ -316,19 +353,7 @@ Example BAD responses (avoid these):
             
         Requirements: 9.4
         """
-        emotion_greetings = {
-            "sadness": "I noticed you might be feeling down. I'm here to listen and support you.",
-            "anger": "I can see you're feeling frustrated or upset. I'm here to listen without judgment.",
-            "frustration": "It sounds like things are feeling difficult right now. I'm here to support you.",
-            "anxiety": "I noticed you might be feeling worried or anxious. I'm here to listen and help if I can."
-        }
-        
-        greeting = emotion_greetings.get(
-            sentiment.emotion.value,
-            "I'm here to listen and support you."
-        )
-        
-        return f"{greeting} While I'm an AI and not a therapist, I genuinely care and want to understand what's on your mind. What's been happening?"
+        return _FALLBACK_GREETINGS.get(sentiment.emotion, _DEFAULT_FALLBACK_GREETING)
     
     def _fallback_response(self) -> str:
         """
@@ -339,12 +364,4 @@ Example BAD responses (avoid these):
             
         Requirements: 9.4
         """
-        fallback_responses = [
-            "I hear you, and I want to understand better. Can you tell me more about what's going on?",
-            "That sounds really difficult. What part of this feels most challenging for you right now?",
-            "I'm listening. How are you feeling about all of this?",
-            "Thank you for sharing that with me. What would feel most helpful to you right now?"
-        ]
-        
-        import random
-        return random.choice(fallback_responses)
+        return random.choice(_FALLBACK_RESPONSES)
@@ -9,7 +9,8 @@ Requirements: 1.1, 1.2, 1.3, 1.4, 1.5, 6.1, 6.2, 6.3
 """
 
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
 from enum import Enum
 import re
 import logging
@@ -35,7 +36,7 @@ class CrisisType(Enum):
     NONE = "none"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SentimentResult:
     """
     Result of sentiment analysis.
@@ -45,13 +46,100 @@ class SentimentResult:
         intensity: Sentiment intensity from 0.0 to 1.0
         requires_support: Whether this sentiment should trigger support
         crisis_type: Type of crisis detected (if any)
-        keywords: List of detected sentiment keywords
+        keywords: Detected sentiment keywords, in match order
     """
     emotion: EmotionType
     intensity: float
     requires_support: bool
     crisis_type: CrisisType
-    keywords: List[str]
+    keywords: Tuple[str, ...]
+
+
+# Shared neutral results, one per crisis type, returned for messages with no
+# emotion keywords and on errors. Fully immutable, so sharing them is safe.
+_NEUTRAL_RESULTS = {
+    crisis_type: SentimentResult(
+        emotion=EmotionType.NEUTRAL,
+        intensity=0.0,
+        requires_support=False,
+        crisis_type=crisis_type,
+        keywords=()
+    )
+    for crisis_type in CrisisType
+}
+_NEUTRAL_RESULT = _NEUTRAL_RESULTS[CrisisType.NONE]
+
+# Emotions that can trigger Support Bot intervention
+_NEGATIVE_EMOTIONS = frozenset({
+    EmotionType.SADNESS,
+    EmotionType.ANGER,
+    EmotionType.FRUSTRATION,
+    EmotionType.ANXIETY,
+})
+
+
+@lru_cache(maxsize=8)
+def _build_keyword_index(
+    negative_items: Tuple[Tuple[EmotionType, Tuple[Tuple[str, float], ...]], ...],
+    positive_items: Tuple[Tuple[str, float], ...],
+    intensifier_words: Tuple[str, ...],
+) -> Tuple[Dict[str, Tuple[Tuple[EmotionType, float], ...]], Pattern[str]]:
+    """
+    Build the keyword lookup table and fused keyword pattern.
+    
+    Cached on the keyword contents, so every analyzer using the default
+    keywords shares one table and one compiled pattern.
+    
+    Args:
+        negative_items: (emotion, ((keyword, weight), ...)) pairs
+        positive_items: (keyword, weight) pairs
+        intensifier_words: Intensifier words
+        
+    Returns:
+        Tuple of (keyword lookup table, compiled keyword pattern)
+    """
+    lexicon: Dict[str, List[Tuple[EmotionType, float]]] = {}
+    for emotion_type, keywords in negative_items:
+        for word, weight in keywords:
+            lexicon.setdefault(word, []).append((emotion_type, weight))
+    for word, weight in positive_items:
+        lexicon.setdefault(word, []).append((EmotionType.POSITIVE, weight))
+    
+    # Keywords are matched as whole tokens, so multi-word entries never
+    # match and are left out of the pattern
+    def alternation(words) -> str:
+        words = sorted((w for w in words if re.fullmatch(r'\w+', w)), key=len, reverse=True)
+        return '|'.join(map(re.escape, words)) or r'(?!)'
+    
+    pattern = re.compile(
+        r'\b(?:(' + alternation(intensifier_words) + r')\W+)?'
+        r'(' + alternation(lexicon) + r')\b'
+    )
+    return {word: tuple(hits) for word, hits in lexicon.items()}, pattern
+
+
+@lru_cache(maxsize=8)
+def _build_crisis_phrases(
+    crisis_items: Tuple[Tuple[CrisisType, Tuple[str, ...]], ...],
+) -> Tuple[Tuple[str, CrisisType], ...]:
+    """
+    Flatten crisis keywords into (phrase, crisis type) pairs in priority order.
+    
+    Phrases that already contain an earlier phrase are dropped, since the
+    earlier phrase always matches first.
+    
+    Args:
+        crisis_items: (crisis type, phrases) pairs in priority order
+        
+    Returns:
+        Tuple of (phrase, crisis type) pairs
+    """
+    phrases: List[Tuple[str, CrisisType]] = []
+    for crisis_type, keywords in crisis_items:
+        for keyword in keywords:
+            if not any(earlier in keyword for earlier, _ in phrases):
+                phrases.append((keyword, crisis_type))
+    return tuple(phrases)
 
 
 class SentimentAnalyzer:
@@ -184,6 +272,90 @@ class SentimentAnalyzer:
             "so": 1.2,
             "incredibly": 1.5,
         }
+        
+        # Word -> (emotion, weight) lookup and fused keyword pattern, built
+        # from the keyword dictionaries on first use
+        self._lexicon: Dict[str, Tuple[Tuple[EmotionType, float], ...]] = {}
+        self._keyword_pattern: Optional[Pattern[str]] = None
+        self._lexicon_source: Optional[tuple] = None
+        
+        # Flattened (phrase, crisis type) pairs in priority order, built from
+        # crisis_keywords on first use
+        self._crisis_phrases: Tuple[Tuple[str, CrisisType], ...] = ()
+        self._crisis_source: Optional[tuple] = None
+    
+    def _keyword_index(
+        self,
+    ) -> Tuple[Dict[str, Tuple[Tuple[EmotionType, float], ...]], Pattern[str]]:
+        """
+        Return the keyword lookup table and the fused keyword pattern.
+        
+        The table maps each word to the (emotion, weight) pairs it
+        contributes. The pattern is a single alternation over every
+        single-word keyword, with an optional intensifier captured in front,
+        so ``analyze`` finds all hits in one regex pass. Both are refreshed
+        whenever ``negative_keywords``, ``positive_keywords`` or
+        ``intensifiers`` is reassigned (or ``refresh_keywords`` is called
+        after an in-place edit), and analyzers with the same keywords share
+        one built copy.
+        
+        Returns:
+            Tuple of (keyword lookup table, compiled keyword pattern)
+        """
+        source = (self.negative_keywords, self.positive_keywords, self.intensifiers)
+        cached = self._lexicon_source
+        if (
+            cached is not None
+            and cached[0] is source[0]
+            and cached[1] is source[1]
+            and cached[2] is source[2]
+        ):
+            return self._lexicon, self._keyword_pattern
+        
+        self._lexicon, self._keyword_pattern = _build_keyword_index(
+            tuple(
+                (emotion_type, tuple(keywords.items()))
+                for emotion_type, keywords in self.negative_keywords.items()
+            ),
+            tuple(self.positive_keywords.items()),
+            tuple(self.intensifiers),
+        )
+        self._lexicon_source = source
+        return self._lexicon, self._keyword_pattern
+    
+    def _crisis_phrase_table(self) -> Tuple[Tuple[str, CrisisType], ...]:
+        """
+        Return the crisis phrases as one flat tuple in priority order.
+        
+        Crisis detection must never miss a phrase, so the table is checked
+        against the current contents of ``crisis_keywords`` on every call
+        (including in-place edits), not just against its identity. The
+        snapshot is small and comparing it is cheap.
+        
+        Returns:
+            Tuple of (phrase, crisis type) pairs
+        """
+        snapshot = tuple(
+            (crisis_type, tuple(keywords))
+            for crisis_type, keywords in self.crisis_keywords.items()
+        )
+        if snapshot == self._crisis_source:
+            return self._crisis_phrases
+        
+        self._crisis_phrases = _build_crisis_phrases(snapshot)
+        self._crisis_source = snapshot
+        return self._crisis_phrases
+    
+    def refresh_keywords(self) -> None:
+        """
+        Rebuild the keyword tables on the next analysis.
+        
+        Reassigning a keyword dictionary is picked up automatically; call
+        this after editing ``negative_keywords``, ``positive_keywords`` or
+        ``intensifiers`` in place.
+        """
+        self._lexicon_source = None
+        self._crisis_source = None
     
     def analyze(self, text: str) -> SentimentResult:
         """
@@ -199,42 +371,34 @@ class SentimentAnalyzer:
         """
         try:
             if not text or not text.strip():
-                return SentimentResult(
-                    emotion=EmotionType.NEUTRAL,
-                    intensity=0.0,
-                    requires_support=False,
-                    crisis_type=CrisisType.NONE,
-                    keywords=[]
-                )
+                return _NEUTRAL_RESULT
             
             # First check for crisis situations
             crisis_type = self.detect_crisis(text)
             
             # Normalize text for analysis
             normalized_text = text.lower()
+            lexicon, keyword_pattern = self._keyword_index()
+            
+            # One pass finds every keyword along with any intensifier before it
+            matches = re.findall(keyword_pattern, normalized_text)
+            if not matches:
+                return _NEUTRAL_RESULTS[crisis_type]
+            
             words = re.findall(r'\b\w+\b', normalized_text)
             
-            # Detect emotion keywords and calculate scores
+            # Calculate emotion scores from the keyword matches
             emotion_scores = {emotion: 0.0 for emotion in EmotionType}
             detected_keywords = []
+            intensifiers = self.intensifiers
             
-            for i, word in enumerate(words):
-                # Check for intensifiers before the word
-                intensifier_multiplier = 1.0
-                if i > 0 and words[i-1] in self.intensifiers:
-                    intensifier_multiplier = self.intensifiers[words[i-1]]
+            for intensifier, word in matches:
+                intensifier_multiplier = intensifiers[intensifier] if intensifier else 1.0
                 
-                # Check negative emotion keywords
-                for emotion_type, keywords in self.negative_keywords.items():
-                    if word in keywords:
-                        weight = keywords[word] * intensifier_multiplier
-                        emotion_scores[emotion_type] += weight
+                for emotion_type, weight in lexicon[word]:
+                    emotion_scores[emotion_type] += weight * intensifier_multiplier
+                    if emotion_type is not EmotionType.POSITIVE:
                         detected_keywords.append(word)
-                
-                # Check positive keywords
-                if word in self.positive_keywords:
-                    weight = self.positive_keywords[word] * intensifier_multiplier
-                    emotion_scores[EmotionType.POSITIVE] += weight
             
             # Determine primary emotion
             max_emotion = max(emotion_scores.items(), key=lambda x: x[1])
@@ -259,8 +423,7 @@ class SentimentAnalyzer:
             # Determine if this should trigger support
             # Only negative emotions can trigger support
             requires_support = (
-                primary_emotion in [EmotionType.SADNESS, EmotionType.ANGER, 
-                                   EmotionType.FRUSTRATION, EmotionType.ANXIETY] and
+                primary_emotion in _NEGATIVE_EMOTIONS and
                 intensity >= self.intensity_threshold
             )
             
@@ -269,19 +432,13 @@ class SentimentAnalyzer:
                 intensity=intensity,
                 requires_support=requires_support,
                 crisis_type=crisis_type,
-                keywords=detected_keywords
+                keywords=tuple(detected_keywords)
             )
         
         except Exception as e:
             # Log error and return neutral sentiment to allow normal processing
             logger.error(f"Sentiment analysis error: {e}")
-            return SentimentResult(
-                emotion=EmotionType.NEUTRAL,
-                intensity=0.0,
-                requires_support=False,
-                crisis_type=CrisisType.NONE,
-                keywords=[]
-            )
+            return _NEUTRAL_RESULT
     
     def detect_crisis(self, text: str) -> CrisisType:
         """
@@ -301,11 +458,10 @@ class SentimentAnalyzer:
             
             normalized_text = text.lower()
             
-            # Check each crisis type
-            for crisis_type, keywords in self.crisis_keywords.items():
-                for keyword in keywords:
-                    if keyword in normalized_text:
-                        return crisis_type
+            # Check each crisis phrase in priority order
+            for keyword, crisis_type in self._crisis_phrase_table():
+                if keyword in normalized_text:
+                    return crisis_type
             
             return CrisisType.NONE
         
@@ -8,7 +8,9 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from backend.instant_answer.tagger import (
     AutoTagger,
-    MessageTags
+    MessageTags,
+    join_tag_string,
+    split_tag_string
 )
 
 
@@ -196,3 +198,23 @@ TECH:
         
         assert topics == []
         assert tech == []
+    
+    def test_empty_tags_are_shared(self):
+        """Test that the shared tag-less instance is empty."""
+        assert MessageTags.EMPTY.topic_tags == ()
+        assert MessageTags.EMPTY.contains_code is False
+
+
+def test_split_tag_string():
+    """Test parsing separator-joined tag metadata back into lists."""
+    assert split_tag_string("") == []
+    assert split_tag_string("python") == ["python"]
+    assert split_tag_string("python,fastapi") == ["python", "fastapi"]
+    # Tolerate whitespace and empty segments from hand-written metadata
+    assert split_tag_string(" python , ,fastapi ") == ["python", "fastapi"]
+
+
+def test_join_tag_string_round_trips():
+    """Test that joined tags split back into the same list."""
+    assert join_tag_string([]) == ""
+    assert split_tag_string(join_tag_string(["python", "fastapi"])) == ["python", "fastapi"]
@@ -168,3 +168,24 @@ class TestCrisisDetection:
         """Test that whitespace-only strings don't trigger crisis detection."""
         result = self.analyzer.analyze("   \n\t  ")
         assert result.crisis_type == CrisisType.NONE
+    
+    def test_crisis_phrases_added_in_place_are_detected(self):
+        """Test that phrases appended to crisis_keywords take effect immediately."""
+        message = "I keep thinking about disappearing forever"
+        assert self.analyzer.detect_crisis(message) == CrisisType.NONE
+        
+        self.analyzer.crisis_keywords[CrisisType.SUICIDE].append("disappearing forever")
+        
+        assert self.analyzer.detect_crisis(message) == CrisisType.SUICIDE
+        assert self.analyzer.analyze(message).crisis_type == CrisisType.SUICIDE
+    
+    def test_refresh_keywords_applies_in_place_emotion_edits(self):
+        """Test that refresh_keywords picks up emotion keywords edited in place."""
+        assert self.analyzer.analyze("meh").keywords == ()
+        
+        self.analyzer.negative_keywords[EmotionType.SADNESS]["meh"] = 1.0
+        self.analyzer.refresh_keywords()
+        
+        result = self.analyzer.analyze("meh")
+        assert result.emotion == EmotionType.SADNESS
+        assert result.keywords == ("meh",)
@@ -8,6 +8,8 @@ This module tests the GeminiService class to ensure:
 - Prompt generation for different use cases
 """
 
+import asyncio
+import time
 import pytest
 from unittest.mock import Mock, patch
 from backend.vecna.gemini_service import GeminiService, GeminiServiceError
@@ -158,6 +160,97 @@ async def test_generate_psychic_grip_narrative_success(mock_genai):
     assert "Techline" in result_text or "..." in result_text
 
 
+@patch('backend.vecna.gemini_service.genai')
+@pytest.mark.asyncio
+async def test_generate_content_max_output_tokens_override(mock_genai):
+    """Test that a per-call token cap is passed to the model request."""
+    mock_response = Mock()
+    mock_response.text = "Short answer"
+    
+    mock_model = Mock()
+    mock_model.generate_content = Mock(return_value=mock_response)
+    mock_genai.GenerativeModel.return_value = mock_model
+    
+    service = GeminiService(api_key="test-key")
+    
+    await service._generate_content("prompt", max_output_tokens=120)
+    mock_model.generate_content.assert_called_once_with(
+        "prompt", generation_config={'max_output_tokens': 120}
+    )
+    
+    # Without an override the model's own config is used unchanged
+    mock_model.generate_content.reset_mock()
+    await service._generate_content("prompt")
+    mock_model.generate_content.assert_called_once_with("prompt")
+
+
+@patch('backend.vecna.gemini_service.genai')
+@pytest.mark.asyncio
+async def test_generate_content_caches_repeated_prompts(mock_genai):
+    """Test that a repeated prompt is served from the response cache."""
+    mock_response = Mock()
+    mock_response.text = "Cached answer"
+    
+    mock_model = Mock()
+    mock_model.generate_content = Mock(return_value=mock_response)
+    mock_genai.GenerativeModel.return_value = mock_model
+    
+    service = GeminiService(api_key="test-key")
+    
+    first = await service._generate_content("Same   prompt")
+    second = await service._generate_content("Same prompt")
+    
+    assert first == second == "Cached answer"
+    assert mock_model.generate_content.call_count == 1
+    assert service.response_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+    
+    # Opting out always reaches the API
+    await service._generate_content("Same prompt", use_cache=False)
+    assert mock_model.generate_content.call_count == 2
+
+
+@patch('backend.vecna.gemini_service.genai')
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call(mock_genai):
+    """Test that identical prompts in flight together make one API call."""
+    mock_response = Mock()
+    mock_response.text = "Shared answer"
+    
+    def slow_generate(prompt):
+        time.sleep(0.1)
+        return mock_response
+    
+    mock_model = Mock()
+    mock_model.generate_content = Mock(side_effect=slow_generate)
+    mock_genai.GenerativeModel.return_value = mock_model
+    
+    service = GeminiService(api_key="test-key")
+    
+    results = await asyncio.gather(
+        *(service._generate_content("Same prompt") for _ in range(3))
+    )
+    
+    assert results == ["Shared answer"] * 3
+    assert mock_model.generate_content.call_count == 1
+    assert not service._pending_requests
+
+
+@patch('backend.vecna.gemini_service.genai')
+@pytest.mark.asyncio
+async def test_generate_content_does_not_cache_failures(mock_genai):
+    """Test that failed calls leave nothing in the response cache."""
+    mock_model = Mock()
+    mock_model.generate_content = Mock(side_effect=Exception("API Error"))
+    mock_genai.GenerativeModel.return_value = mock_model
+    
+    service = GeminiService(api_key="test-key")
+    
+    with pytest.raises(GeminiServiceError):
+        await service._generate_content("prompt", max_retries=0)
+    
+    assert len(service.response_cache) == 0
+
+
 @patch('backend.vecna.gemini_service.genai')
 @pytest.mark.asyncio
 async def test_generate_psychic_grip_narrative_fallback(mock_genai):
@@ -7,9 +7,11 @@ updating, and deleting messages in ChromaDB.
 Requirements: 6.1, 6.2, 6.3, 10.5
 """
 
+import asyncio
+import os
 import pytest
 from datetime import datetime
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import patch
 import chromadb
 from chromadb.config import Settings
 
@@ -18,18 +20,53 @@ from backend.instant_answer.classifier import MessageType, MessageClassification
 from backend.instant_answer.tagger import MessageTags
 
 
+@pytest.fixture(scope="module")
+def event_loop():
+    """
+    Run every async test in this module on a single event loop.
+    
+    pytest-asyncio 0.21 creates and closes a fresh loop per test by default;
+    widening the event_loop fixture lets the tests share one. Fixtures that
+    hold per-test state (storage_service, chroma_collection) stay
+    function-scoped.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class FakeGeminiService:
+    """Minimal Gemini stand-in; storage tests patch embeddings directly."""
+    
+    def __init__(self):
+        self.generate_content_calls = 0
+    
+    async def _generate_content(self, *args, **kwargs):
+        self.generate_content_calls += 1
+        return ""
+
+
 @pytest.fixture
 def mock_gemini_service():
-    """Create a mock Gemini service."""
-    service = Mock()
-    service._generate_content = AsyncMock()
-    return service
+    """Create a lightweight fake Gemini service."""
+    return FakeGeminiService()
 
 
-@pytest.fixture
-def chroma_client():
-    """Create an in-memory ChromaDB client for testing."""
-    return chromadb.Client(Settings(anonymized_telemetry=False, allow_reset=True))
+@pytest.fixture(scope="module")
+def chroma_client(tmp_path_factory):
+    """
+    Create a persistent ChromaDB client shared by every test in this module.
+    
+    The client lives in a temp directory unique to the pytest-xdist worker
+    (or "main" when not distributed), so workers never share a SQLite file
+    and the client is only built once per worker.
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    path = tmp_path_factory.mktemp(f"chroma_{worker_id}")
+    return chromadb.PersistentClient(
+        path=str(path),
+        settings=Settings(anonymized_telemetry=False, allow_reset=True)
+    )
 
 
 @pytest.fixture
@@ -54,7 +91,7 @@ def storage_service(chroma_collection, mock_gemini_service):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_classification():
     """Create a sample message classification."""
     return MessageClassification(
@@ -65,7 +102,7 @@ def sample_classification():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_tags():
     """Create sample message tags."""
     return MessageTags(
@@ -10,7 +10,7 @@ This module tests:
 """
 
 import pytest
-from datetime import datetime, timedelta
+import time
 from backend.rate_limiter import RateLimiter, UserRateLimitState
 
 
@@ -25,7 +25,7 @@ class TestUserRateLimitState:
         assert len(state.message_timestamps) == 0
         assert len(state.command_timestamps) == 0
         assert len(state.violations) == 0
-        assert state.muted_until is None
+        assert state.muted_until == 0.0
         assert state.warning_sent is False
     
     def test_is_muted_when_not_muted(self):
@@ -36,15 +36,27 @@ class TestUserRateLimitState:
     def test_is_muted_when_muted(self):
         """Test is_muted returns True when user is muted."""
         state = UserRateLimitState("testuser")
-        state.muted_until = datetime.utcnow() + timedelta(seconds=30)
+        state.muted_until = time.monotonic() + 30
         assert state.is_muted() is True
     
     def test_is_muted_expires(self):
         """Test that mute expires after timeout."""
         state = UserRateLimitState("testuser")
-        state.muted_until = datetime.utcnow() - timedelta(seconds=1)
+        state.muted_until = time.monotonic() - 1
         assert state.is_muted() is False
-        assert state.muted_until is None
+    
+    def test_expired_mute_cleared_on_next_check(self):
+        """Test that an expired mute is cleared and the warning re-armed."""
+        limiter = RateLimiter(message_limit=2, message_window=10, mute_duration=30)
+        state = limiter._get_user_state("testuser")
+        state.muted_until = time.monotonic() - 1
+        state.warning_sent = True
+        
+        allowed, message, disconnect = limiter.check_message_limit("testuser")
+        
+        assert allowed is True
+        assert state.muted_until == 0.0
+        assert state.warning_sent is False
     
     def test_add_timestamps(self):
         """Test adding message and command timestamps."""
@@ -56,6 +68,17 @@ class TestUserRateLimitState:
         state.add_command_timestamp()
         assert len(state.command_timestamps) == 1
     
+    def test_timestamp_windows_bounded_by_limits(self):
+        """Test that timestamp deques never hold more than the limit."""
+        state = UserRateLimitState("testuser", message_limit=3, command_limit=2)
+        
+        for i in range(5):
+            state.add_message_timestamp()
+            state.add_command_timestamp()
+        
+        assert len(state.message_timestamps) == 3
+        assert len(state.command_timestamps) == 2
+    
     def test_add_violation(self):
         """Test recording violations."""
         state = UserRateLimitState("testuser")
@@ -70,7 +93,7 @@ class TestUserRateLimitState:
         
         # Add old violation
         state.add_violation('message')
-        state.violations[0].timestamp = datetime.utcnow() - timedelta(seconds=120)
+        state.violations[0].timestamp = time.monotonic() - 120
         
         # Add recent violation
         state.add_violation('command')
@@ -78,6 +101,24 @@ class TestUserRateLimitState:
         recent = state.get_recent_violations(seconds=60)
         assert len(recent) == 1
         assert recent[0].violation_type == 'command'
+        
+        assert state.count_recent_violations(seconds=60) == 1
+        assert state.count_recent_violations(seconds=60, violation_type='command') == 1
+        assert state.count_recent_violations(seconds=60, violation_type='message') == 0
+    
+    def test_old_violations_pruned(self):
+        """Test that violations outside the escalation window are discarded."""
+        state = UserRateLimitState("testuser")
+        
+        for i in range(5):
+            state.add_violation('message')
+        for violation in state.violations:
+            violation.timestamp = time.monotonic() - 120
+        
+        state.add_violation('command')
+        
+        assert len(state.violations) == 1
+        assert state.violations[0].violation_type == 'command'
 
 
 class TestRateLimiter:
@@ -121,6 +162,22 @@ class TestRateLimiter:
             assert message == ""
             assert disconnect is False
     
+    def test_message_window_expires(self):
+        """Test that messages are allowed again once the window has passed."""
+        limiter = RateLimiter(message_limit=2, message_window=10)
+        start = time.monotonic()
+        
+        for i in range(2):
+            allowed, _, _ = limiter.check_message_limit("testuser", now=start)
+            assert allowed is True
+        
+        allowed, _, _ = limiter.check_message_limit("testuser", now=start + 1)
+        assert allowed is False
+        
+        allowed, message, _ = limiter.check_message_limit("testuser", now=start + 11)
+        assert allowed is True
+        assert message == ""
+    
     def test_message_exceeds_limit_warning(self):
         """Test that exceeding message limit sends warning."""
         limiter = RateLimiter(message_limit=3, message_window=10)
@@ -180,6 +237,18 @@ class TestRateLimiter:
         assert disconnect is True
         assert "disconnected" in message.lower()
     
+    def test_message_limit_bulk(self):
+        """Test checking several users' message limits in one call."""
+        limiter = RateLimiter(message_limit=1, message_window=10)
+        limiter.check_message_limit("busy_user")
+        
+        results = limiter.check_message_limit_bulk(["busy_user", "new_user"])
+        
+        assert len(results) == 2
+        assert results[0][0] is False
+        assert "Warning" in results[0][1]
+        assert results[1] == (True, "", False)
+    
     def test_command_within_limit(self):
         """Test that commands within limit are allowed."""
         limiter = RateLimiter(command_limit=5, command_window=5)
@@ -254,6 +323,25 @@ class TestRateLimiter:
         limiter.reset_user("testuser")
         assert "testuser" not in limiter.user_states
     
+    def test_reset_user_state_reused(self):
+        """Test that released states are recycled with clean state."""
+        limiter = RateLimiter(message_limit=1)
+        
+        limiter.check_message_limit("olduser")
+        limiter.check_message_limit("olduser")  # Violation
+        old_state = limiter.user_states["olduser"]
+        limiter.reset_user("olduser")
+        
+        allowed, _, _ = limiter.check_message_limit("newuser")
+        new_state = limiter.user_states["newuser"]
+        
+        assert allowed is True
+        assert new_state is old_state
+        assert new_state.username == "newuser"
+        assert len(new_state.message_timestamps) == 1
+        assert len(new_state.violations) == 0
+        assert new_state.warning_sent is False
+    
     def test_cleanup_inactive_users(self):
         """Test cleaning up inactive users."""
         limiter = RateLimiter()
@@ -273,6 +361,32 @@ class TestRateLimiter:
         assert "user2" in limiter.user_states
         assert "user3" not in limiter.user_states
     
+    def test_user_states_capped_at_max_users(self):
+        """Test that the least recently checked user is evicted at capacity."""
+        limiter = RateLimiter(max_users=2)
+        
+        limiter.check_message_limit("user1")
+        limiter.check_message_limit("user2")
+        limiter.check_message_limit("user1")  # user2 is now least recent
+        limiter.check_message_limit("user3")
+        
+        assert len(limiter.user_states) == 2
+        assert "user1" in limiter.user_states
+        assert "user3" in limiter.user_states
+        assert "user2" not in limiter.user_states
+    
+    def test_idle_user_states_evicted(self):
+        """Test that idle user states are dropped when new users arrive."""
+        limiter = RateLimiter()
+        
+        limiter.check_message_limit("idle_user")
+        limiter.user_states["idle_user"].last_seen -= limiter.state_ttl * 2
+        
+        limiter.check_message_limit("new_user")
+        
+        assert "idle_user" not in limiter.user_states
+        assert "new_user" in limiter.user_states
+    
     def test_separate_message_and_command_limits(self):
         """Test that message and command limits are tracked separately."""
         limiter = RateLimiter(message_limit=3, command_limit=2)
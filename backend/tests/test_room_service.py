@@ -21,11 +21,35 @@ class TestRoomModel:
         assert len(room.users) == 0
         assert room.created_at is not None
     
-    def test_room_users_is_set(self):
-        """Test that room.users is a set."""
+    def test_room_users_is_dict(self):
+        """Test that room.users maps usernames to join times in join order."""
         room = Room(name="Test", description="Test")
         
-        assert isinstance(room.users, set)
+        assert isinstance(room.users, dict)
+        
+        room.add_user("user2")
+        room.add_user("user1")
+        
+        assert list(room.users) == ["user2", "user1"]
+        assert isinstance(room.users["user1"], float)
+
+
+    def test_room_users_snapshot_cached(self):
+        """Test that the users snapshot is reused until membership changes."""
+        room = Room(name="Test", description="Test")
+        room.add_user("user1")
+        
+        snapshot = room.get_users()
+        assert snapshot == ("user1",)
+        assert room.get_users() is snapshot
+        
+        room.add_user("user2")
+        assert room.get_users() is not snapshot
+        assert room.get_users() == ("user1", "user2")
+        
+        assert room.remove_user("user1") is True
+        assert room.remove_user("user1") is False
+        assert room.get_users() == ("user2",)
 
 
 class TestRoomService:
@@ -55,6 +79,9 @@ class TestRoomService:
         assert lobby.name == "Lobby"
         assert "gathering space" in lobby.description.lower()
         assert len(lobby.users) == 0
+        
+        # Default rooms share a single creation time
+        assert len({room.created_at for room in service.rooms.values()}) == 1
     
     def test_create_default_rooms_idempotent(self):
         """Test that calling create_default_rooms multiple times doesn't create duplicates."""
@@ -244,6 +271,33 @@ class TestRoomService:
         
         assert room_name is None
     
+    def test_get_user_room_after_move_and_leave(self):
+        """Test that get_user_room tracks moves and leaves."""
+        service = RoomService()
+        service.create_default_rooms()
+        
+        user = User(username="testuser", password_hash="hash")
+        service.join_room(user, "Lobby")
+        service.move_user(user, "Lobby", "Techline")
+        
+        assert service.get_user_room("testuser") == "Techline"
+        
+        service.leave_room(user, "Techline")
+        
+        assert service.get_user_room("testuser") is None
+    
+    def test_get_user_room_deleted_room(self):
+        """Test that get_user_room ignores rooms removed from the service."""
+        service = RoomService()
+        service.create_default_rooms()
+        service.rooms["support-testuser"] = Room("support-testuser", "Private support")
+        
+        user = User(username="testuser", password_hash="hash")
+        service.join_room(user, "support-testuser")
+        del service.rooms["support-testuser"]
+        
+        assert service.get_user_room("testuser") is None
+    
     def test_move_user(self):
         """Test that move_user moves a user between rooms."""
         service = RoomService()
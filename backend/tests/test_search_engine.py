@@ -4,7 +4,11 @@ Tests for Semantic Search Engine.
 Requirements: 3.1, 3.2, 3.3, 3.4, 3.5
 """
 
+import asyncio
+import dataclasses
+import time
 import pytest
+import numpy as np
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 from backend.instant_answer.search_engine import (
@@ -13,168 +17,276 @@ from backend.instant_answer.search_engine import (
 )
 from backend.instant_answer.classifier import MessageType
 from backend.instant_answer.tagger import MessageTags
+import google.ai.generativelanguage as glm
+
+
+def embed_response(values):
+    """Build a Gemini embed_content response carrying the given vector."""
+    return glm.EmbedContentResponse(embedding=glm.ContentEmbedding(values=values))
+
+
+class StubCollection:
+    """
+    Minimal stand-in for a ChromaDB collection.
+    
+    Returns fixed results and records query keyword arguments, which is all
+    the search engine tests need and far cheaper than a MagicMock.
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Restore empty results and forget recorded calls."""
+        self.query_result = {'ids': [[]], 'documents': [[]], 'metadatas': [[]], 'distances': [[]]}
+        self.get_result = {'ids': [], 'embeddings': []}
+        self.query_calls = []
+    
+    def query(self, **kwargs):
+        self.query_calls.append(kwargs)
+        return self.query_result
+    
+    def get(self, **kwargs):
+        return self.get_result
 
 
 class TestSemanticSearchEngine:
     """Test suite for semantic search engine."""
     
-    @pytest.fixture
-    def mock_gemini_service(self):
-        """Create a mock Gemini service."""
-        service = MagicMock()
-        return service
+    @pytest.fixture(scope="module")
+    def gemini_service(self):
+        """Create a placeholder Gemini service (the engine never calls it)."""
+        return object()
     
-    @pytest.fixture
-    def mock_chroma_collection(self):
-        """Create a mock ChromaDB collection."""
-        collection = MagicMock()
-        collection.query = MagicMock()
-        return collection
+    @pytest.fixture(scope="module")
+    def chroma_collection(self):
+        """Create a stub ChromaDB collection shared by the module."""
+        return StubCollection()
     
-    @pytest.fixture
-    def search_engine(self, mock_gemini_service, mock_chroma_collection):
-        """Create a search engine with mock dependencies."""
+    @pytest.fixture(scope="module")
+    def search_engine(self, gemini_service, chroma_collection):
+        """Create a search engine shared by the module."""
         return SemanticSearchEngine(
-            mock_gemini_service,
-            mock_chroma_collection,
+            gemini_service,
+            chroma_collection,
             embedding_model="models/embedding-001"
         )
     
+    @pytest.fixture(autouse=True)
+    def reset_shared_state(self, search_engine, chroma_collection):
+        """Clear per-test state on the shared engine and collection."""
+        chroma_collection.reset()
+        search_engine.embedding_cache.clear()
+        search_engine.embedding_cache.hits = 0
+        search_engine.embedding_cache.misses = 0
+        # Resolve the (patched) embedding client afresh in each test
+        search_engine._embedding_client = None
+    
+    @pytest.fixture
+    def mock_embed_client(self):
+        """Patch the Gemini generative client used for embeddings."""
+        client = MagicMock()
+        client.embed_content.return_value = embed_response([0.1, 0.2, 0.3])
+        with patch(
+            'google.generativeai.client.get_default_generative_client',
+            return_value=client
+        ):
+            yield client
+    
     @pytest.mark.asyncio
-    async def test_generate_embedding(self, search_engine):
+    async def test_generate_embedding(self, search_engine, mock_embed_client):
         """Test embedding generation using Gemini API."""
-        with patch('google.generativeai.embed_content') as mock_embed:
-            mock_embed.return_value = {
-                'embedding': [0.1, 0.2, 0.3, 0.4, 0.5]
-            }
-            
-            embedding = await search_engine.generate_embedding("test query")
+        mock_embed_client.embed_content.return_value = embed_response(
+            [0.1, 0.2, 0.3, 0.4, 0.5]
+        )
+        
+        embedding = await search_engine.generate_embedding("test query")
+        
+        assert embedding.dtype == np.float32
+        assert np.allclose(embedding, [0.1, 0.2, 0.3, 0.4, 0.5])
+        mock_embed_client.embed_content.assert_called_once()
+        request = mock_embed_client.embed_content.call_args.args[0]
+        # Queries always use the model stored message embeddings were built with
+        assert request.model == SemanticSearchEngine.QUERY_EMBEDDING_MODEL
+        assert request.content.parts[0].text == "test query"
+        assert request.task_type == glm.TaskType.RETRIEVAL_QUERY
+    
+    def test_request_embeddings_falls_back_to_public_api(self, search_engine):
+        """Test that missing SDK internals fall back to genai.embed_content."""
+        with patch.dict('sys.modules', {'google.generativeai.embedding': None}), \
+                patch('google.generativeai.embed_content') as mock_embed:
+            mock_embed.return_value = {'embedding': [0.1, 0.2, 0.3]}
+            single = search_engine._request_embeddings(["one"], "models/x", "retrieval_query")
             
-            assert embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
-            mock_embed.assert_called_once_with(
-                model="models/embedding-001",
-                content="test query",
-                task_type="retrieval_document"
-            )
+            mock_embed.return_value = {'embedding': [[0.1, 0.2], [0.3, 0.4]]}
+            batch = search_engine._request_embeddings(["a", "b"], "models/x", "retrieval_query")
+        
+        assert single.dtype == np.float32
+        assert np.allclose(single, [[0.1, 0.2, 0.3]])
+        assert np.allclose(batch, [[0.1, 0.2], [0.3, 0.4]])
+        mock_embed.assert_called_with(
+            model="models/x", content=["a", "b"], task_type="retrieval_query"
+        )
+    
+    def test_request_embeddings_falls_back_on_client_error(self, search_engine, mock_embed_client):
+        """Test that any failure in the fast path falls back to genai.embed_content."""
+        mock_embed_client.embed_content.side_effect = AttributeError("embedding")
+        with patch('google.generativeai.embed_content') as mock_embed:
+            mock_embed.return_value = {'embedding': [0.1, 0.2, 0.3]}
+            embedding = search_engine._request_embeddings(["one"], "models/x", "retrieval_query")
+        
+        assert np.allclose(embedding, [[0.1, 0.2, 0.3]])
+        mock_embed_client.embed_content.assert_called_once()
+        mock_embed.assert_called_once_with(
+            model="models/x", content="one", task_type="retrieval_query"
+        )
     
     @pytest.mark.asyncio
-    async def test_search_with_results(self, search_engine, mock_chroma_collection):
-        """Test search that returns results above threshold."""
-        # Mock embedding generation
-        with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
-            mock_embed.return_value = [0.1, 0.2, 0.3]
-            
-            # Mock ChromaDB query results
-            mock_chroma_collection.query.return_value = {
-                'ids': [['msg1', 'msg2']],
-                'documents': [['Answer 1', 'Answer 2']],
-                'metadatas': [[
-                    {
-                        'username': 'alice',
-                        'timestamp': '2025-12-05T10:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': ['python'],
-                        'tech_keywords': ['fastapi'],
-                        'contains_code': True,
-                        'code_language': 'python'
-                    },
-                    {
-                        'username': 'bob',
-                        'timestamp': '2025-12-05T11:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': ['javascript'],
-                        'tech_keywords': ['react'],
-                        'contains_code': False,
-                        'code_language': None
-                    }
-                ]],
-                'distances': [[0.2, 0.4]]  # Similarity scores: 0.8, 0.6
-            }
-            
-            results = await search_engine.search(
-                query="How do I use FastAPI?",
-                room_filter="Techline",
-                message_type_filter=MessageType.ANSWER,
-                limit=5,
-                min_similarity=0.5
-            )
-            
-            assert len(results) == 2
-            assert results[0].message_id == 'msg1'
-            assert results[0].similarity_score == 0.8
-            assert results[0].username == 'alice'
-            assert results[1].message_id == 'msg2'
-            assert results[1].similarity_score == 0.6
+    async def test_repeated_query_embedding_cached(
+        self, search_engine, chroma_collection, mock_embed_client
+    ):
+        """Test that repeating a query reuses the cached embedding."""
+        chroma_collection.query_result = {
+            'ids': [[]],
+            'documents': [[]],
+            'metadatas': [[]],
+            'distances': [[]]
+        }
+        
+        await search_engine.search(query="How do I use FastAPI?")
+        await search_engine.search(query="How do I use FastAPI?")
+        
+        mock_embed_client.embed_content.assert_called_once()
+        assert len(chroma_collection.query_calls) == 2
+        assert search_engine.embedding_cache.hits == 1
     
     @pytest.mark.asyncio
-    async def test_search_filters_by_threshold(self, search_engine, mock_chroma_collection):
-        """Test that search filters out results below similarity threshold."""
-        with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
-            mock_embed.return_value = [0.1, 0.2, 0.3]
-            
-            # Mock results with varying similarity scores
-            mock_chroma_collection.query.return_value = {
-                'ids': [['msg1', 'msg2', 'msg3']],
-                'documents': [['Answer 1', 'Answer 2', 'Answer 3']],
-                'metadatas': [[
-                    {
-                        'username': 'alice',
-                        'timestamp': '2025-12-05T10:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    },
-                    {
-                        'username': 'bob',
-                        'timestamp': '2025-12-05T11:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    },
-                    {
-                        'username': 'charlie',
-                        'timestamp': '2025-12-05T12:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    }
-                ]],
-                'distances': [[0.1, 0.4, 0.5]]  # Similarities: 0.9, 0.6, 0.5
-            }
-            
-            # Set threshold to 0.7 - should only return first result
-            results = await search_engine.search(
-                query="test query",
-                min_similarity=0.7
-            )
+    async def test_cached_embedding_never_calls_api(self, search_engine, mock_embed_client):
+        """Test that cached_embedding only reads the query embedding cache."""
+        assert search_engine.cached_embedding("How do I use FastAPI?") is None
+        mock_embed_client.embed_content.assert_not_called()
+        
+        embedding = await search_engine.generate_embedding("How do I use FastAPI?")
+        
+        assert search_engine.cached_embedding("How do I use FastAPI?") is embedding
+        mock_embed_client.embed_content.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batches_uncached(self, search_engine, mock_embed_client):
+        """Test that only uncached, distinct texts are sent in one batch call."""
+        await search_engine.generate_embedding("cached query")
+        
+        mock_embed_client.batch_embed_contents.return_value = glm.BatchEmbedContentsResponse(
+            embeddings=[
+                glm.ContentEmbedding(values=[0.4]),
+                glm.ContentEmbedding(values=[0.5])
+            ]
+        )
+        
+        embeddings = await search_engine.generate_embeddings(
+            ["first", "cached query", "second", "first"]
+        )
+        
+        mock_embed_client.batch_embed_contents.assert_called_once()
+        batch_request = mock_embed_client.batch_embed_contents.call_args.args[0]
+        assert [r.content.parts[0].text for r in batch_request.requests] == ["first", "second"]
+        assert len(embeddings) == 4
+        assert np.allclose(embeddings[0], [0.4])
+        assert np.allclose(embeddings[1], [0.1, 0.2, 0.3])
+        assert np.allclose(embeddings[2], [0.5])
+        assert np.allclose(embeddings[3], [0.4])
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_embedding_requests_coalesced(self, search_engine, mock_embed_client):
+        """Test that concurrent requests for the same text share one API call."""
+        def slow_embed(request):
+            time.sleep(0.05)
+            return embed_response([0.1, 0.2, 0.3])
+        
+        mock_embed_client.embed_content.side_effect = slow_embed
+        
+        embeddings = await asyncio.gather(
+            *(search_engine.generate_embedding("same") for _ in range(10))
+        )
+        
+        assert mock_embed_client.embed_content.call_count == 1
+        assert all(np.allclose(e, [0.1, 0.2, 0.3]) for e in embeddings)
+        assert search_engine._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_embedding_cache_disabled(
+        self, gemini_service, chroma_collection, mock_embed_client
+    ):
+        """Test that a zero-size cache always calls the embedding API."""
+        engine = SemanticSearchEngine(
+            gemini_service,
+            chroma_collection,
+            embedding_cache_size=0
+        )
+        
+        await engine.generate_embedding("test query")
+        await engine.generate_embedding("test query")
+        
+        assert mock_embed_client.embed_content.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_embedding_client_reused(self, gemini_service, chroma_collection):
+        """Test that an injected embedding client is used for every call."""
+        client = MagicMock()
+        client.embed_content.return_value = embed_response([0.1, 0.2, 0.3])
+        engine = SemanticSearchEngine(
+            gemini_service,
+            chroma_collection,
+            embedding_cache_size=0,
+            embedding_client=client
+        )
+        
+        with patch('google.generativeai.client.get_default_generative_client') as get_client:
+            await engine.generate_embedding("first")
+            await engine.generate_embedding("second")
             
-            assert len(results) == 1
-            assert results[0].similarity_score == 0.9
+            get_client.assert_not_called()
+        assert client.embed_content.call_count == 2
     
     @pytest.mark.asyncio
-    async def test_search_returns_empty_for_no_matches(self, search_engine, mock_chroma_collection):
-        """Test that search returns empty list when no results above threshold."""
+    @pytest.mark.parametrize(
+        "distances, min_similarity, limit, expected_ids, expected_scores",
+        [
+            # Results above threshold are returned in ranked order
+            ([0.2, 0.4], 0.5, 5, ['msg0', 'msg1'], [0.8, 0.6]),
+            # Results below the threshold are filtered out
+            ([0.1, 0.4, 0.5], 0.7, 5, ['msg0'], [0.9]),
+            # Nothing above the threshold returns an empty list
+            ([0.5], 0.7, 5, [], []),
+            # Unsorted ChromaDB output is ranked by similarity
+            ([0.4, 0.1, 0.3], 0.5, 5, ['msg1', 'msg2', 'msg0'], [0.9, 0.7, 0.6]),
+            # The result limit is respected
+            ([0.1, 0.2, 0.3, 0.4, 0.5], 0.0, 3, ['msg0', 'msg1', 'msg2'], [0.9, 0.8, 0.7]),
+        ],
+        ids=["with_results", "filters_by_threshold", "empty_for_no_matches",
+             "ranks_by_similarity", "respects_limit"]
+    )
+    async def test_search_results(
+        self,
+        search_engine,
+        chroma_collection,
+        distances,
+        min_similarity,
+        limit,
+        expected_ids,
+        expected_scores
+    ):
+        """Test thresholding, ranking and limiting of search results."""
         with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
             mock_embed.return_value = [0.1, 0.2, 0.3]
             
-            # Mock results all below threshold
-            mock_chroma_collection.query.return_value = {
-                'ids': [['msg1']],
-                'documents': [['Answer 1']],
+            ids = [f'msg{i}' for i in range(len(distances))]
+            chroma_collection.query_result = {
+                'ids': [ids],
+                'documents': [[f'Answer {i}' for i in range(len(distances))]],
                 'metadatas': [[
                     {
-                        'username': 'alice',
+                        'username': f'author_{message_id}',
                         'timestamp': '2025-12-05T10:00:00',
                         'room': 'Techline',
                         'message_type': 'answer',
@@ -183,25 +295,28 @@ class TestSemanticSearchEngine:
                         'contains_code': False,
                         'code_language': None
                     }
+                    for message_id in ids
                 ]],
-                'distances': [[0.5]]  # Similarity: 0.5
+                'distances': [distances]
             }
             
-            # Set threshold to 0.7 - should return empty
             results = await search_engine.search(
-                query="test query",
-                min_similarity=0.7
+                query="How do I use FastAPI?",
+                limit=limit,
+                min_similarity=min_similarity
             )
             
-            assert len(results) == 0
+            assert [r.message_id for r in results] == expected_ids
+            assert [r.similarity_score for r in results] == expected_scores
+            assert [r.username for r in results] == [f'author_{i}' for i in expected_ids]
     
     @pytest.mark.asyncio
-    async def test_search_applies_metadata_filters(self, search_engine, mock_chroma_collection):
+    async def test_search_applies_metadata_filters(self, search_engine, chroma_collection):
         """Test that search applies room and message type filters."""
         with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
             mock_embed.return_value = [0.1, 0.2, 0.3]
             
-            mock_chroma_collection.query.return_value = {
+            chroma_collection.query_result = {
                 'ids': [[]],
                 'documents': [[]],
                 'metadatas': [[]],
@@ -217,104 +332,83 @@ class TestSemanticSearchEngine:
             )
             
             # Verify ChromaDB was called with correct filters
-            mock_chroma_collection.query.assert_called_once()
-            call_args = mock_chroma_collection.query.call_args
+            assert len(chroma_collection.query_calls) == 1
+            call_kwargs = chroma_collection.query_calls[0]
             
-            assert call_args[1]['where'] == {
-                'room': 'Techline',
-                'message_type': 'answer'
+            assert call_kwargs['where'] == {
+                '$and': [
+                    {'room': {'$eq': 'Techline'}},
+                    {'message_type': {'$eq': 'answer'}}
+                ]
             }
     
+    def test_search_result_is_immutable(self):
+        """Test that SearchResult is a slotted, frozen dataclass."""
+        result = SearchResult(
+            message_id='msg1',
+            message_text='Test message',
+            username='alice',
+            timestamp=datetime(2025, 12, 5, 10, 0, 0),
+            similarity_score=0.8,
+            tags=MessageTags(
+                topic_tags=[],
+                tech_keywords=[],
+                contains_code=False,
+                code_language=None
+            ),
+            room='Techline'
+        )
+        
+        assert not hasattr(result, '__dict__')
+        with pytest.raises(AttributeError):
+            result.similarity_score = 0.9
+    
+    def test_n_results_scaled_and_capped(self, gemini_service, chroma_collection):
+        """Test that ChromaDB candidate counts follow the limit up to a ceiling."""
+        engine = SemanticSearchEngine(
+            gemini_service,
+            chroma_collection,
+            overfetch_factor=3,
+            max_n_results=20
+        )
+        
+        assert engine._n_results(1) == 3
+        assert engine._n_results(5) == 15
+        assert engine._n_results(50) == 20
+    
+    def test_where_filter_reused(self, search_engine):
+        """Test that where filters are built once per room and message type."""
+        first = search_engine._build_where_filter("Techline", MessageType.ANSWER)
+        second = search_engine._build_where_filter("Techline", MessageType.ANSWER)
+        
+        assert first is second
+        assert first == {
+            "$and": [
+                {"room": {"$eq": "Techline"}},
+                {"message_type": {"$eq": "answer"}}
+            ]
+        }
+        assert search_engine._build_where_filter("Techline", None) == {
+            "room": {"$eq": "Techline"}
+        }
+    
     @pytest.mark.asyncio
-    async def test_search_ranks_by_similarity(self, search_engine, mock_chroma_collection):
-        """Test that search results are ranked by similarity score."""
-        with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
-            mock_embed.return_value = [0.1, 0.2, 0.3]
-            
-            # Mock results in non-sorted order
-            mock_chroma_collection.query.return_value = {
-                'ids': [['msg1', 'msg2', 'msg3']],
-                'documents': [['Answer 1', 'Answer 2', 'Answer 3']],
-                'metadatas': [[
-                    {
-                        'username': 'alice',
-                        'timestamp': '2025-12-05T10:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    },
-                    {
-                        'username': 'bob',
-                        'timestamp': '2025-12-05T11:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    },
-                    {
-                        'username': 'charlie',
-                        'timestamp': '2025-12-05T12:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    }
-                ]],
-                'distances': [[0.4, 0.1, 0.3]]  # Similarities: 0.6, 0.9, 0.7
-            }
-            
-            results = await search_engine.search(
-                query="test query",
-                min_similarity=0.5
-            )
-            
-            # Should be sorted by similarity (descending)
-            assert len(results) == 3
-            assert results[0].similarity_score == 0.9
-            assert results[1].similarity_score == 0.7
-            assert results[2].similarity_score == 0.6
+    async def test_warmup_queries_with_stored_embedding(self, search_engine, chroma_collection):
+        """Test that warmup issues one query using a stored embedding."""
+        chroma_collection.get_result = {'ids': ['msg1'], 'embeddings': [[0.1, 0.2, 0.3]]}
+        
+        assert await search_engine.warmup() is True
+        
+        assert len(chroma_collection.query_calls) == 1
+        call_kwargs = chroma_collection.query_calls[0]
+        assert call_kwargs['query_embeddings'] == [[0.1, 0.2, 0.3]]
+        assert call_kwargs['n_results'] == 1
     
     @pytest.mark.asyncio
-    async def test_search_respects_limit(self, search_engine, mock_chroma_collection):
-        """Test that search respects the result limit."""
-        with patch.object(search_engine, 'generate_embedding', new_callable=AsyncMock) as mock_embed:
-            mock_embed.return_value = [0.1, 0.2, 0.3]
-            
-            # Mock 5 results
-            mock_chroma_collection.query.return_value = {
-                'ids': [['msg1', 'msg2', 'msg3', 'msg4', 'msg5']],
-                'documents': [['A1', 'A2', 'A3', 'A4', 'A5']],
-                'metadatas': [[
-                    {
-                        'username': f'user{i}',
-                        'timestamp': '2025-12-05T10:00:00',
-                        'room': 'Techline',
-                        'message_type': 'answer',
-                        'topic_tags': [],
-                        'tech_keywords': [],
-                        'contains_code': False,
-                        'code_language': None
-                    }
-                    for i in range(5)
-                ]],
-                'distances': [[0.1, 0.2, 0.3, 0.4, 0.5]]
-            }
-            
-            # Request only 3 results
-            results = await search_engine.search(
-                query="test query",
-                limit=3,
-                min_similarity=0.0
-            )
-            
-            assert len(results) == 3
+    async def test_warmup_skips_empty_collection(self, search_engine, chroma_collection):
+        """Test that warmup does nothing on an empty collection."""
+        assert await search_engine.warmup() is False
+        assert chroma_collection.query_calls == []
     
     def test_parse_search_results_with_tags(self, search_engine):
         """Test parsing of search results with complete metadata."""
@@ -348,6 +442,49 @@ class TestSemanticSearchEngine:
         assert results[0].tags.contains_code is True
         assert results[0].tags.code_language == 'python'
     
+    def test_parse_search_results_returns_plain_results(self, search_engine):
+        """Test that parsed results support the standard dataclass operations."""
+        raw_results = {
+            'ids': [['msg1']],
+            'documents': [['Test message']],
+            'metadatas': [[
+                {
+                    'username': 'alice',
+                    'timestamp': '2025-12-05T10:00:00',
+                    'room': 'Techline',
+                    'topic_tags': 'python,api',
+                    'tech_keywords': '',
+                    'contains_code': False,
+                    'code_language': ''
+                }
+            ]],
+            'distances': [[0.2]]
+        }
+        
+        result = search_engine._parse_search_results(raw_results, min_similarity=0.5)[0]
+        
+        assert type(result) is SearchResult
+        assert result.tags.topic_tags == ['python', 'api']
+        assert result.tags.code_language is None
+        assert result.timestamp == datetime(2025, 12, 5, 10, 0, 0)
+        
+        moved = dataclasses.replace(result, room='General')
+        assert moved.room == 'General'
+        assert dataclasses.replace(moved, room='Techline') == result
+    
+    def test_parse_search_results_limit(self, search_engine):
+        """Test that only the top results up to the limit are built."""
+        raw_results = {
+            'ids': [['msg1', 'msg2', 'msg3']],
+            'documents': [['A1', 'A2', 'A3']],
+            'metadatas': [[{'username': 'alice'}, {'username': 'bob'}, {'username': 'carol'}]],
+            'distances': [[0.3, 0.1, 0.2]]
+        }
+        
+        results = search_engine._parse_search_results(raw_results, min_similarity=0.0, limit=2)
+        
+        assert [r.message_id for r in results] == ['msg2', 'msg3']
+    
     def test_parse_search_results_empty(self, search_engine):
         """Test parsing of empty search results."""
         raw_results = {
@@ -230,3 +230,43 @@ class TestSemanticSearchEngineIntegration:
             assert result.tags.tech_keywords == ['fastapi', 'uvicorn', 'asyncio']
             assert result.tags.contains_code is True
             assert result.tags.code_language == 'python'
+    
+    @pytest.mark.asyncio
+    async def test_batch_search_single_chromadb_query(self, search_engine, mock_chroma_collection):
+        """Test that batch search embeds and queries all queries in one call each."""
+        def metadata(username):
+            return {
+                'username': username,
+                'timestamp': '2025-12-05T10:00:00',
+                'room': 'Techline',
+                'message_type': 'answer',
+                'topic_tags': [],
+                'tech_keywords': [],
+                'contains_code': False,
+                'code_language': None
+            }
+        
+        with patch.object(search_engine, 'generate_embeddings', new_callable=AsyncMock) as mock_embed:
+            mock_embed.return_value = [[0.1] * 768, [0.2] * 768, [0.3] * 768]
+            
+            mock_chroma_collection.query.return_value = {
+                'ids': [['msg_a1', 'msg_a2'], ['msg_b1'], []],
+                'documents': [['A1', 'A2'], ['B1'], []],
+                'metadatas': [[metadata('alice'), metadata('bob')], [metadata('charlie')], []],
+                'distances': [[0.3, 0.1], [0.6], []]
+            }
+            
+            results = await search_engine.batch_search(
+                ["first query", "second query", "third query"],
+                min_similarity=0.5
+            )
+            
+            mock_embed.assert_called_once_with(["first query", "second query", "third query"])
+            assert mock_chroma_collection.query.call_count == 1
+            call_args = mock_chroma_collection.query.call_args
+            assert len(call_args.kwargs['query_embeddings']) == 3
+            
+            assert len(results) == 3
+            assert [r.message_id for r in results[0]] == ['msg_a2', 'msg_a1']
+            assert results[1] == []
+            assert results[2] == []
@@ -223,3 +223,73 @@ class TestSentimentAnalyzer:
             assert sensitive_result.is_trigger
         if strict_result.intensity < 0.9:
             assert not strict_result.is_trigger
+    
+    def test_repeated_messages_use_cache(self):
+        """Test that repeated messages reuse cached scores."""
+        first = self.analyzer.analyze("I HATE this terrible system")
+        second = self.analyzer.analyze("  i hate THIS terrible system ")
+        
+        assert self.analyzer._score_cached.cache_info().hits == 1
+        assert first == second
+        
+        # Cached results must not share mutable state
+        first.keywords.append("extra")
+        assert "extra" not in self.analyzer.analyze("i hate this terrible system").keywords
+    
+    def test_cached_scores_respect_threshold_changes(self):
+        """Test that the trigger decision follows the current threshold."""
+        message = "This is bad"
+        assert not self.analyzer.analyze(message).is_trigger
+        
+        self.analyzer.intensity_threshold = 0.5
+        assert self.analyzer.analyze(message).is_trigger
+    
+    def test_analyze_batch_matches_analyze(self):
+        """Test that batch analysis matches analyzing each message."""
+        messages = [
+            "I hate this terrible system",
+            "This is great, thank you!",
+            "This is very bad",
+            "very",
+            "",
+            "   \n\t  ",
+            "!@#$",
+            "I just wanted to say that I really hate this one particular thing",
+            "This is great but also terrible",
+        ]
+        
+        results = self.analyzer.analyze_batch(messages)
+        
+        assert results == [self.analyzer.analyze(message) for message in messages]
+
+    
+    def test_analyzers_share_keyword_tables(self):
+        """Test that analyzers with the same keywords share built tables."""
+        other = SentimentAnalyzer(intensity_threshold=0.5)
+        assert other._weight_tables() is self.analyzer._weight_tables()
+        
+        other.negative_keywords = {"meh": 0.9}
+        assert other._weight_tables() is not self.analyzer._weight_tables()
+        assert other.analyze("meh").keywords == ["meh"]
+    
+    def test_reassigned_keywords_invalidate_cached_scores(self):
+        """Test that cached scores are dropped when keywords are reassigned."""
+        analyzer = SentimentAnalyzer()
+        assert analyzer.analyze("meh").keywords == []
+        assert not analyzer.is_high_negative_intensity("meh")
+        
+        analyzer.negative_keywords = {**analyzer.negative_keywords, "meh": 1.0}
+        
+        assert analyzer.analyze("meh").keywords == ["meh"]
+        assert analyzer.is_high_negative_intensity("meh")
+    
+    def test_clear_cache_picks_up_in_place_keyword_edits(self):
+        """Test that clear_cache applies keywords edited in place."""
+        analyzer = SentimentAnalyzer()
+        assert analyzer.analyze("meh").keywords == []
+        
+        analyzer.negative_keywords["meh"] = 1.0
+        analyzer.clear_cache()
+        
+        assert analyzer.analyze("meh").keywords == ["meh"]
+        assert analyzer.analyze_batch(["meh"])[0].keywords == ["meh"]
@@ -28,7 +28,7 @@ class TestSentimentErrorHandling:
             assert result.intensity == 0.0
             assert result.requires_support is False
             assert result.crisis_type == CrisisType.NONE
-            assert result.keywords == []
+            assert result.keywords == ()
     
     def test_analyze_handles_none_input(self):
         """Test that analyze handles None input gracefully."""
@@ -41,7 +41,7 @@ class TestSentimentErrorHandling:
         assert result.intensity == 0.0
         assert result.requires_support is False
         assert result.crisis_type == CrisisType.NONE
-        assert result.keywords == []
+        assert result.keywords == ()
     
     def test_analyze_handles_empty_string(self):
         """Test that analyze handles empty string gracefully."""
@@ -54,7 +54,7 @@ class TestSentimentErrorHandling:
         assert result.intensity == 0.0
         assert result.requires_support is False
         assert result.crisis_type == CrisisType.NONE
-        assert result.keywords == []
+        assert result.keywords == ()
     
     def test_detect_crisis_handles_error_gracefully(self):
         """Test that detect_crisis returns NONE when error occurs."""
@@ -141,3 +141,22 @@ class TestSentimentErrorHandling:
         
         # Restore original
         analyzer.crisis_keywords = original_keywords
+    
+    def test_neutral_results_are_shared(self):
+        """Test that neutral and error paths return the shared neutral result."""
+        analyzer = SentimentAnalyzer()
+        
+        empty = analyzer.analyze("")
+        assert analyzer.analyze(None) is empty
+        assert analyzer.analyze("Hello everyone") is empty
+        
+        with patch('backend.support.sentiment.re.findall', side_effect=Exception("Regex error")):
+            assert analyzer.analyze("This should fail") is empty
+        
+        # Shared results hold no mutable state another analyzer could see
+        with pytest.raises(AttributeError):
+            empty.keywords.append("poison")
+        assert SentimentAnalyzer().analyze("hello").keywords == ()
+        
+        # Neutral messages still carry any detected crisis type
+        assert analyzer.analyze("I want to end it all").crisis_type == CrisisType.SUICIDE
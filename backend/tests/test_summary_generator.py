@@ -11,13 +11,17 @@ Tests cover:
 Requirements: 4.2, 4.4, 4.5
 """
 
+import dataclasses
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 from backend.instant_answer.summary_generator import (
     SummaryGenerator,
-    InstantAnswer
+    InstantAnswer,
+    SemanticSummaryCache
 )
 from backend.instant_answer.search_engine import SearchResult
 from backend.instant_answer.tagger import MessageTags
@@ -25,10 +29,8 @@ from backend.instant_answer.tagger import MessageTags
 
 @pytest.fixture
 def mock_gemini_service():
-    """Create a mock Gemini service."""
-    service = MagicMock()
-    service._generate_content = AsyncMock()
-    return service
+    """Create a stub Gemini service; only _generate_content is a mock."""
+    return SimpleNamespace(_generate_content=AsyncMock())
 
 
 @pytest.fixture
@@ -94,8 +96,9 @@ async def test_generate_summary_with_results(summary_generator, mock_gemini_serv
     assert 0.0 <= answer.confidence <= 1.0
     assert answer.is_novel_question is False
     
-    # Verify Gemini was called
+    # Verify Gemini was called with the summary token cap
     mock_gemini_service._generate_content.assert_called_once()
+    assert mock_gemini_service._generate_content.call_args.kwargs['max_output_tokens'] == 300
 
 
 @pytest.mark.asyncio
@@ -249,6 +252,86 @@ async def test_source_attribution_limits_to_five(summary_generator, mock_gemini_
     assert source_count <= 5
 
 
+@pytest.mark.asyncio
+async def test_sources_are_most_similar_results(summary_generator, mock_gemini_service):
+    """Test that attribution uses the most similar results, not the first ones."""
+    scores = [0.3, 0.9, 0.4, 0.8, 0.5, 0.7, 0.6]
+    results = [
+        SearchResult(
+            message_id=f"msg_{i}",
+            message_text=f"Message {i}",
+            username=f"user{i}",
+            timestamp=datetime.now(),
+            similarity_score=score,
+            tags=MessageTags([], [], False, None),
+            room="Techline"
+        )
+        for i, score in enumerate(scores)
+    ]
+    
+    mock_gemini_service._generate_content.return_value = "Answer"
+    
+    answer = await summary_generator.generate_summary("Question", results)
+    
+    for i in (1, 3, 5, 6, 4):
+        assert f"user{i} (" in answer.summary
+    assert "user0 (" not in answer.summary
+    assert "user2 (" not in answer.summary
+    assert answer.source_messages == results
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_reuses_answer(mock_gemini_service, sample_search_results):
+    """Test that similar questions over the same sources reuse one answer."""
+    embeddings = {
+        "How do I add JWT auth?": np.array([1.0, 0.0, 0.0], dtype=np.float32),
+        "How can I add JWT authentication?": np.array([0.98, 0.2, 0.0], dtype=np.float32),
+        "How do I deploy with Docker?": np.array([0.0, 1.0, 0.0], dtype=np.float32),
+    }
+    generator = SummaryGenerator(
+        mock_gemini_service,
+        summary_cache=SemanticSummaryCache(similarity_threshold=0.9),
+        embedding_lookup=embeddings.get
+    )
+    mock_gemini_service._generate_content.return_value = "Use OAuth2PasswordBearer."
+    
+    first = await generator.generate_summary("How do I add JWT auth?", sample_search_results)
+    similar = await generator.generate_summary(
+        "How can I add JWT authentication?", sample_search_results
+    )
+    
+    assert mock_gemini_service._generate_content.call_count == 1
+    assert similar.summary == first.summary
+    assert similar.confidence == first.confidence
+    
+    # Different question or different sources both miss the cache
+    await generator.generate_summary("How do I deploy with Docker?", sample_search_results)
+    await generator.generate_summary("How do I add JWT auth?", sample_search_results[:1])
+    assert mock_gemini_service._generate_content.call_count == 3
+    
+    # An edited source message is a miss, not a stale summary
+    edited = [dataclasses.replace(sample_search_results[0], message_text="Use API keys instead.")]
+    edited += sample_search_results[1:]
+    await generator.generate_summary("How do I add JWT auth?", edited)
+    assert mock_gemini_service._generate_content.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_skipped_without_embedding(mock_gemini_service, sample_search_results):
+    """Test that questions without a known embedding always call Gemini."""
+    generator = SummaryGenerator(
+        mock_gemini_service,
+        summary_cache=SemanticSummaryCache(),
+        embedding_lookup=lambda question: None
+    )
+    mock_gemini_service._generate_content.return_value = "Answer"
+    
+    await generator.generate_summary("Question", sample_search_results)
+    await generator.generate_summary("Question", sample_search_results)
+    
+    assert mock_gemini_service._generate_content.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_error_handling_propagates(summary_generator, mock_gemini_service, sample_search_results):
     """Test that errors from Gemini service are propagated."""
@@ -290,3 +373,25 @@ async def test_inline_code_extraction(summary_generator):
     # Should extract inline code (at least 10 chars)
     assert len(code_snippets) > 0
     assert any("OAuth2PasswordBearer" in snippet for snippet in code_snippets)
+
+
+def test_code_snippet_extraction_skips_repeated_messages(summary_generator):
+    """Test that identical message texts are only scanned once."""
+    quoted = "Traceback:\n```\nKeyError: 'token'\n```"
+    results = [
+        SearchResult(
+            message_id=f"msg_{i}",
+            message_text=text,
+            username=f"user{i}",
+            timestamp=datetime.now(),
+            similarity_score=0.8,
+            tags=MessageTags([], [], True, None),
+            room="Techline"
+        )
+        for i, text in enumerate([quoted, "Use `OAuth2PasswordBearer`", quoted])
+    ]
+    
+    code_snippets = summary_generator._extract_code_snippets(results)
+    
+    assert code_snippets.count("```\nKeyError: 'token'\n```") == 1
+    assert code_snippets[-1] == "`OAuth2PasswordBearer`"
@@ -8,19 +8,18 @@ Requirements: 4.1, 4.2, 4.3, 4.4, 4.5, 5.1, 5.2, 5.3, 5.4, 5.5
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 from backend.support.bot import SupportBot
 from backend.support.sentiment import SentimentResult, EmotionType, CrisisType
 from backend.vecna.user_profile import UserProfile
-from backend.vecna.gemini_service import GeminiService, GeminiServiceError
+from backend.vecna.gemini_service import GeminiServiceError
 
 
 @pytest.fixture
 def mock_gemini_service():
     """Create a mock Gemini service."""
-    service = Mock(spec=GeminiService)
-    service._generate_content = AsyncMock()
-    return service
+    return SimpleNamespace(_generate_content=AsyncMock())
 
 
 @pytest.fixture
@@ -29,7 +28,7 @@ def support_bot(mock_gemini_service):
     return SupportBot(mock_gemini_service)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_user_profile():
     """Create a sample user profile for testing."""
     return UserProfile(
@@ -82,6 +81,7 @@ class TestSupportBotGreeting:
         
         assert "listen" in result.lower() or "support" in result.lower()
         assert mock_gemini_service._generate_content.called
+        assert mock_gemini_service._generate_content.call_args.kwargs["use_cache"] is False
     
     @pytest.mark.asyncio
     async def test_generate_greeting_with_anger(
@@ -188,6 +188,8 @@ class TestSupportBotResponse:
         call_args = mock_gemini_service._generate_content.call_args
         prompt = call_args[0][0]
         assert "programming" in prompt or "music" in prompt or "reading" in prompt
+        # Support replies are conversational, never served from the cache
+        assert call_args.kwargs["use_cache"] is False
     
     @pytest.mark.asyncio
     async def test_generate_response_fallback(
@@ -273,6 +275,18 @@ class TestSupportBotCrisisResponse:
         result = support_bot.generate_crisis_response(CrisisType.NONE)
         
         assert result == ""
+    
+    def test_crisis_response_is_cached(self, support_bot):
+        """Test that each crisis message is formatted once per bot."""
+        first = support_bot.generate_crisis_response(CrisisType.SUICIDE)
+        
+        with patch.object(
+            support_bot.hotline_service, 'format_hotline_message'
+        ) as format_message:
+            second = support_bot.generate_crisis_response(CrisisType.SUICIDE)
+        
+        assert second is first
+        format_message.assert_not_called()
 
 
 class TestSupportBotPromptGeneration:
@@ -7,6 +7,7 @@ greeting generation, response generation, and crisis handling.
 This ensures all components work together correctly.
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from backend.support.bot import SupportBot
@@ -15,7 +16,7 @@ from backend.vecna.user_profile import UserProfile
 from backend.vecna.gemini_service import GeminiService
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sentiment_analyzer():
     """Create a sentiment analyzer."""
     return SentimentAnalyzer(intensity_threshold=0.6)
@@ -35,7 +36,7 @@ def support_bot(mock_gemini_service):
     return SupportBot(mock_gemini_service)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_profile():
     """Create a user profile."""
     return UserProfile(
@@ -219,23 +220,24 @@ class TestSupportBotIntegration:
         from backend.vecna.gemini_service import GeminiServiceError
         mock_gemini_service._generate_content.side_effect = GeminiServiceError("API Error")
         
-        # Should still get a greeting (fallback)
-        greeting = await support_bot.generate_greeting(
-            user_profile,
-            message,
-            sentiment
+        # Should still get a greeting and a response (fallbacks); the two
+        # calls are independent, so await them together
+        greeting, response = await asyncio.gather(
+            support_bot.generate_greeting(
+                user_profile,
+                message,
+                sentiment
+            ),
+            support_bot.generate_response(
+                "I need help",
+                user_profile,
+                []
+            )
         )
         
         assert greeting
         assert "listen" in greeting.lower() or "support" in greeting.lower()
         
-        # Should still get a response (fallback)
-        response = await support_bot.generate_response(
-            "I need help",
-            user_profile,
-            []
-        )
-        
         assert response
         assert "?" in response
     
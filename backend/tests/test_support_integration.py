@@ -18,7 +18,7 @@ from backend.database import User
 from backend.vecna.user_profile import UserProfile
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sentiment_analyzer():
     """Create a sentiment analyzer instance."""
     return SentimentAnalyzer(intensity_threshold=0.6)
@@ -59,7 +59,7 @@ def test_get_profile_creates_new(profile_service, test_user):
     assert profile.interests == []
     assert profile.frequent_rooms == {}
     assert profile.recent_rooms == []
-    assert profile.command_history == []
+    assert len(profile.command_history) == 0
     assert profile.unfinished_boards == []
 
 
@@ -357,6 +357,23 @@ def test_detect_command_repetition_with_repetition(profile_service, test_user):
     assert is_repetition is True
 
 
+def test_detect_command_repetition_alternating_commands(profile_service, test_user):
+    """Test that alternating between two commands counts as repetition."""
+    profile = profile_service.get_profile(test_user.id)
+    
+    now = datetime.utcnow()
+    profile.command_history = [
+        ("/list", now),
+        ("/help", now - timedelta(seconds=5)),
+        ("/list", now - timedelta(seconds=10)),
+        ("/help", now - timedelta(seconds=15))
+    ]
+    
+    is_repetition = profile.detect_command_repetition(window_seconds=60)
+    
+    assert is_repetition is True
+
+
 def test_detect_command_repetition_outside_window(profile_service, test_user):
     """Test that command repetition only considers time window."""
     profile = profile_service.get_profile(test_user.id)
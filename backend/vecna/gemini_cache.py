@@ -0,0 +1,108 @@
+"""
+Prompt Response Cache for Gemini Service.
+
+This module provides an LRU cache of Gemini responses keyed on the prompt,
+so a repeated prompt is answered locally instead of with another API
+round-trip.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class PromptResponseCache:
+    """
+    LRU cache of generated responses with a time-to-live.
+    
+    Prompts are normalized (runs of whitespace collapsed) and hashed with
+    SHA-256, so near-identical prompts that differ only in formatting share
+    an entry and long prompts are not kept in memory. The per-call token
+    cap is part of the key, since it changes what the model returns.
+    
+    Attributes:
+        max_size: Maximum number of cached responses (0 disables caching)
+        ttl_seconds: How long an entry stays valid
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that required an API call
+    """
+    
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[bytes, Optional[int]], Tuple[float, str]] = OrderedDict()
+    
+    @staticmethod
+    def make_key(prompt: str, max_output_tokens: Optional[int] = None) -> Tuple[bytes, Optional[int]]:
+        """
+        Build the cache key for a prompt.
+        
+        Args:
+            prompt: Prompt sent to the model
+            max_output_tokens: Per-call token cap, if any
+        
+        Returns:
+            (SHA-256 digest of the normalized prompt, max_output_tokens) tuple
+        """
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(normalized.encode("utf-8")).digest(), max_output_tokens
+    
+    def get(self, key: Tuple[bytes, Optional[int]]) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key from make_key
+        
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+    
+    def put(self, key: Tuple[bytes, Optional[int]], response: str) -> None:
+        """
+        Store a response, evicting the least recently used entry if full.
+        
+        Args:
+            key: Key from make_key
+            response: Generated text to cache
+        """
+        if self.max_size <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses and current size
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -12,9 +12,10 @@ Requirements: 8.1, 8.2, 8.3, 8.4, 8.5
 import logging
 import time
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import google.generativeai as genai
 from google.generativeai.types import GenerationConfig
+from backend.vecna.gemini_cache import PromptResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +44,9 @@ class GeminiService:
         model: str = "gemini-2.0-flash",
         temperature: float = 0.5,
         max_tokens: int = 500,
-        monitor: Optional[Any] = None
+        monitor: Optional[Any] = None,
+        response_cache_size: int = 256,
+        response_cache_ttl: float = 300.0
     ):
         """
         Initialize Gemini service.
@@ -54,6 +57,8 @@ class GeminiService:
             temperature: Generation temperature (0.0-2.0, default: 0.9)
             max_tokens: Maximum tokens to generate (default: 500)
             monitor: Optional VecnaMonitor for logging API calls
+            response_cache_size: Maximum cached prompt responses (0 disables)
+            response_cache_ttl: Seconds a cached response stays valid
         
         Raises:
             GeminiServiceError: If API key is missing or initialization fails
@@ -68,6 +73,8 @@ class GeminiService:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.monitor = monitor
+        self.response_cache = PromptResponseCache(response_cache_size, response_cache_ttl)
+        self._pending_requests: Dict[Tuple[bytes, Optional[int]], asyncio.Future] = {}
         
         try:
             # Configure the API
@@ -151,7 +158,7 @@ class GeminiService:
         try:
             prompt = self._create_adversarial_prompt(user_message, user_profile)
             
-            response = await self._generate_content(prompt, operation="hostile_response", user_id=user_id)
+            response = await self._generate_content(prompt, operation="hostile_response", user_id=user_id, use_cache=False)
             
             logger.info("Generated Vecna hostile response")
             return response
@@ -195,7 +202,7 @@ class GeminiService:
         try:
             prompt = self._create_psychic_grip_prompt(user_profile, username)
             
-            response = await self._generate_content(prompt, operation="psychic_grip", user_id=user_id)
+            response = await self._generate_content(prompt, operation="psychic_grip", user_id=user_id, use_cache=False)
             
             # Parse the response to extract 3 messages
             messages = []
@@ -225,7 +232,9 @@ class GeminiService:
         operation: str = "unknown", 
         user_id: Optional[int] = None,
         timeout: float = 10.0,
-        max_retries: int = 2
+        max_retries: int = 2,
+        max_output_tokens: Optional[int] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Generate content from Gemini API with monitoring, retry logic, and timeout handling.
@@ -234,6 +243,7 @@ class GeminiService:
         - Exponential backoff retry (2 retries with 1s, 2s delays)
         - Timeout handling (default 10 seconds)
         - Error logging and monitoring
+        - Response caching, with concurrent identical prompts sharing one call
         
         Args:
             prompt: The prompt to send to the API
@@ -241,6 +251,10 @@ class GeminiService:
             user_id: User ID for logging (if applicable)
             timeout: Timeout in seconds for API call (default: 10.0)
             max_retries: Maximum number of retries (default: 2)
+            max_output_tokens: Per-call cap on generated tokens, lower than the
+                service-wide max_tokens (default: None, use max_tokens)
+            use_cache: Serve a repeated prompt from the response cache
+                (default: True; disable for responses that should vary)
         
         Returns:
             Generated text content
@@ -250,14 +264,75 @@ class GeminiService:
         
         Requirements: 8.1, 8.4
         """
+        if not use_cache:
+            return await self._request_content(
+                prompt, operation, user_id, timeout, max_retries, max_output_tokens
+            )
+        
+        cache_key = self.response_cache.make_key(prompt, max_output_tokens)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Gemini response cache hit for {operation}")
+            return cached
+        
+        # Coalesce concurrent identical prompts onto one in-flight request;
+        # shield it so one caller's cancellation doesn't fail the others
+        pending = self._pending_requests.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._request_content(
+                prompt, operation, user_id, timeout, max_retries, max_output_tokens
+            ))
+            self._pending_requests[cache_key] = pending
+            pending.add_done_callback(
+                lambda _: self._pending_requests.pop(cache_key, None)
+            )
+        else:
+            logger.debug(f"Joining in-flight Gemini request for {operation}")
+        
+        text = await asyncio.shield(pending)
+        self.response_cache.put(cache_key, text)
+        return text
+    
+    async def _request_content(
+        self,
+        prompt: str,
+        operation: str,
+        user_id: Optional[int],
+        timeout: float,
+        max_retries: int,
+        max_output_tokens: Optional[int]
+    ) -> str:
+        """
+        Call the Gemini API with retry and timeout handling (uncached).
+        
+        Args:
+            prompt: The prompt to send to the API
+            operation: Type of operation for logging
+            user_id: User ID for logging (if applicable)
+            timeout: Timeout in seconds for each API call
+            max_retries: Maximum number of retries
+            max_output_tokens: Per-call cap on generated tokens, or None
+        
+        Returns:
+            Generated text content
+        
+        Raises:
+            GeminiServiceError: If API call fails after all retries
+        """
         start_time = time.time()
         last_error = None
         
+        # Overrides are merged into the model's GenerationConfig, so the
+        # server stops generating at the cap instead of the service default
+        request_kwargs = {}
+        if max_output_tokens is not None:
+            request_kwargs['generation_config'] = {'max_output_tokens': max_output_tokens}
+        
         for attempt in range(max_retries + 1):
             try:
                 # Apply timeout to the API call
                 response = await asyncio.wait_for(
-                    asyncio.to_thread(self.model.generate_content, prompt),
+                    asyncio.to_thread(self.model.generate_content, prompt, **request_kwargs),
                     timeout=timeout
                 )
                 
@@ -7,9 +7,61 @@ negative sentiment in user messages.
 """
 
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from itertools import repeat
+from typing import List, Tuple
 import re
 
+import numpy as np
+
+
+# Word tokenizer; \w+ alone yields the same tokens as \b\w+\b
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=8)
+def _build_weight_tables(
+    negative_items: Tuple[Tuple[str, float], ...],
+    positive_items: Tuple[Tuple[str, float], ...],
+    intensifier_items: Tuple[Tuple[str, float], ...],
+) -> tuple:
+    """
+    Build the token weight tables for the given keyword contents.
+    
+    Cached on the keyword contents, so every analyzer using the default
+    keywords shares one set of tables. The arrays are read-only.
+    
+    Args:
+        negative_items: (keyword, weight) pairs for negative sentiment
+        positive_items: (keyword, weight) pairs for positive sentiment
+        intensifier_items: (word, multiplier) pairs for intensifiers
+        
+    Returns:
+        Tuple of (token_weights, word -> row mapping, negative weights,
+        positive weights, intensifier multipliers)
+    """
+    negative_keywords = dict(negative_items)
+    positive_keywords = dict(positive_items)
+    intensifiers = dict(intensifier_items)
+    words = list(dict.fromkeys([*negative_keywords, *positive_keywords, *intensifiers]))
+    token_weights = {
+        word: (
+            negative_keywords.get(word, 0.0),
+            0.0 if word in negative_keywords else positive_keywords.get(word, 0.0),
+            intensifiers.get(word, 1.0),
+        )
+        for word in words
+    }
+    token_index = {word: row for row, word in enumerate(words, start=1)}
+    
+    arrays = []
+    for column in zip((0.0, 0.0, 1.0), *token_weights.values()):
+        array = np.array(column)
+        array.flags.writeable = False
+        arrays.append(array)
+    
+    return (token_weights, token_index, *arrays)
+
 
 @dataclass
 class SentimentResult:
@@ -36,15 +88,24 @@ class SentimentAnalyzer:
     that should trigger Vecna's emotional response mode.
     """
     
-    def __init__(self, intensity_threshold: float = 0.7):
+    def __init__(self, intensity_threshold: float = 0.7, cache_size: int = 4096):
         """
         Initialize the sentiment analyzer.
         
         Args:
             intensity_threshold: Minimum intensity to trigger Vecna (0.0-1.0)
+            cache_size: Maximum number of normalized messages whose scores are
+                cached (0 disables caching)
         """
         self.intensity_threshold = intensity_threshold
         
+        # Token weight tables, built from the keyword dictionaries on first use
+        self._tables: tuple = ()
+        self._tables_source = None
+        
+        # Per-instance LRU cache of scores keyed on normalized text
+        self._score_cached = lru_cache(maxsize=cache_size)(self._score)
+        
         # Negative sentiment keywords with intensity weights
         self.negative_keywords = {
             # High intensity (1.0)
@@ -116,13 +177,18 @@ class SentimentAnalyzer:
         """
         Analyze text sentiment.
         
+        Scores are cached per normalized message, so repeated inputs skip
+        tokenization and keyword scanning. The trigger decision always uses
+        the current ``intensity_threshold``.
+        
         Args:
             text: Text to analyze
             
         Returns:
             SentimentResult with polarity, intensity, and trigger status
         """
-        if not text or not text.strip():
+        normalized_text = text.strip().lower() if text else ""
+        if not normalized_text:
             return SentimentResult(
                 polarity=0.0,
                 intensity=0.0,
@@ -130,31 +196,192 @@ class SentimentAnalyzer:
                 keywords=[]
             )
         
-        # Normalize text for analysis
-        normalized_text = text.lower()
-        words = re.findall(r'\b\w+\b', normalized_text)
+        # Refresh the tables first so reassigned keywords drop stale scores
+        self._weight_tables()
+        polarity, intensity, keywords = self._score_cached(normalized_text)
+        
+        # Determine if this should trigger Vecna
+        # Only negative sentiment can trigger
+        is_trigger = (
+            polarity < 0 and 
+            intensity >= self.intensity_threshold
+        )
+        
+        return SentimentResult(
+            polarity=polarity,
+            intensity=intensity,
+            is_trigger=is_trigger,
+            keywords=list(keywords)
+        )
+    
+    def analyze_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        Analyze many texts at once.
+        
+        All texts are tokenized into one flat token list, and per-message
+        scores are summed with ``np.bincount`` instead of a Python loop per
+        message. Results match calling ``analyze`` on each text.
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            One SentimentResult per input text, in order
+        """
+        tokens: List[str] = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for row, text in enumerate(texts):
+            if text:
+                words = _WORD_PATTERN.findall(text.lower())
+                tokens.extend(words)
+                lengths[row] = len(words)
+        
+        count = len(tokens)
+        row_ids = np.repeat(np.arange(len(texts)), lengths)
+        
+        # Map every token to a row of the weight table in one C-level pass
+        _, token_index, negative_table, positive_table, intensifier_table = self._weight_tables()
+        ids = np.fromiter(map(token_index.get, tokens, repeat(0)), dtype=np.intp, count=count)
+        negative_w = negative_table[ids]
+        
+        # Each token is amplified by an intensifier directly before it in the
+        # same message
+        multiplier = np.ones(count)
+        if count > 1:
+            multiplier[1:] = intensifier_table[ids[:-1]]
+            starts = np.cumsum(lengths) - lengths
+            multiplier[starts[lengths > 0]] = 1.0
+        
+        size = len(texts)
+        negative_scores = np.bincount(row_ids, weights=negative_w * multiplier, minlength=size)
+        positive_scores = np.bincount(
+            row_ids, weights=positive_table[ids] * multiplier, minlength=size
+        )
+        
+        # Calculate polarity (-1.0 to 1.0)
+        total = negative_scores + positive_scores
+        polarity = np.divide(
+            positive_scores - negative_scores,
+            total,
+            out=np.zeros(size),
+            where=total > 0,
+        )
+        
+        # Calculate intensity (0.0 to 1.0), dampened by message length
+        word_counts = np.maximum(lengths, 1)
+        length_factor = np.where(word_counts <= 5, 1.0, (5 / word_counts) ** 0.5)
+        intensity = np.minimum(
+            np.maximum(negative_scores, positive_scores) * length_factor, 1.0
+        )
+        
+        is_trigger = (polarity < 0) & (intensity >= self.intensity_threshold)
+        
+        keywords: List[List[str]] = [[] for _ in range(size)]
+        hits = np.flatnonzero(negative_w)
+        for row, index in zip(row_ids[hits].tolist(), hits.tolist()):
+            keywords[row].append(tokens[index])
+        
+        return [
+            SentimentResult(
+                polarity=p,
+                intensity=i,
+                is_trigger=t,
+                keywords=k,
+            )
+            for p, i, t, k in zip(
+                polarity.tolist(), intensity.tolist(), is_trigger.tolist(), keywords
+            )
+        ]
+    
+    def _weight_tables(self) -> tuple:
+        """
+        Return the token weight tables, rebuilding them if keywords changed.
+        
+        ``token_weights`` maps each keyword or intensifier to its
+        (negative, positive, intensifier) weights for the per-message scan.
+        The arrays hold the same weights by row for ``analyze_batch``; row 0
+        is any word that is not a keyword or an intensifier. A negative
+        keyword scores no positive weight, matching the precedence in
+        ``analyze``. The tables are refreshed whenever ``negative_keywords``,
+        ``positive_keywords`` or ``intensifiers`` is reassigned, which also
+        clears the score cache, and analyzers with the same keywords share
+        one built copy.
+        
+        Returns:
+            Tuple of (token_weights, word -> row mapping, negative weights,
+            positive weights, intensifier multipliers)
+        """
+        source = (self.negative_keywords, self.positive_keywords, self.intensifiers)
+        cached = self._tables_source
+        if (
+            cached is not None
+            and cached[0] is source[0]
+            and cached[1] is source[1]
+            and cached[2] is source[2]
+        ):
+            return self._tables
+        
+        self._tables = _build_weight_tables(
+            tuple(self.negative_keywords.items()),
+            tuple(self.positive_keywords.items()),
+            tuple(self.intensifiers.items()),
+        )
+        self._tables_source = source
+        
+        # Scores cached under the old keywords are stale
+        self._score_cached.cache_clear()
+        return self._tables
+    
+    def clear_cache(self) -> None:
+        """
+        Drop cached scores and weight tables.
+        
+        Reassigning a keyword dictionary is picked up automatically; call
+        this after editing ``negative_keywords``, ``positive_keywords`` or
+        ``intensifiers`` in place so the next analysis rebuilds the tables.
+        """
+        self._tables_source = None
+        self._score_cached.cache_clear()
+    
+    def _score(self, normalized_text: str) -> Tuple[float, float, Tuple[str, ...]]:
+        """
+        Score lowercased, stripped text.
+        
+        Args:
+            normalized_text: Lowercased text with surrounding whitespace removed
+            
+        Returns:
+            Tuple of (polarity, intensity, detected negative keywords)
+        """
+        words = _WORD_PATTERN.findall(normalized_text)
+        token_weights = self._weight_tables()[0]
         
         # Detect keywords and calculate sentiment
         negative_score = 0.0
         positive_score = 0.0
         detected_keywords = []
         
-        for i, word in enumerate(words):
-            # Check for intensifiers before the word
-            intensifier_multiplier = 1.0
-            if i > 0 and words[i-1] in self.intensifiers:
-                intensifier_multiplier = self.intensifiers[words[i-1]]
+        # Multiplier contributed by the previous word if it is an intensifier
+        intensifier_multiplier = 1.0
+        
+        for word in words:
+            weights = token_weights.get(word)
+            if weights is None:
+                intensifier_multiplier = 1.0
+                continue
+            
+            negative_weight, positive_weight, multiplier = weights
             
             # Check negative keywords
-            if word in self.negative_keywords:
-                weight = self.negative_keywords[word] * intensifier_multiplier
-                negative_score += weight
+            if negative_weight:
+                negative_score += negative_weight * intensifier_multiplier
                 detected_keywords.append(word)
             
             # Check positive keywords
-            elif word in self.positive_keywords:
-                weight = self.positive_keywords[word] * intensifier_multiplier
-                positive_score += weight
+            elif positive_weight:
+                positive_score += positive_weight * intensifier_multiplier
+            
+            intensifier_multiplier = multiplier
         
         # Calculate polarity (-1.0 to 1.0)
         total_score = negative_score + positive_score
@@ -178,25 +405,14 @@ class SentimentAnalyzer:
             length_factor = (5 / word_count) ** 0.5
             intensity = min(raw_intensity * length_factor, 1.0)
         
-        # Determine if this should trigger Vecna
-        # Only negative sentiment can trigger
-        is_trigger = (
-            polarity < 0 and 
-            intensity >= self.intensity_threshold
-        )
-        
-        return SentimentResult(
-            polarity=polarity,
-            intensity=intensity,
-            is_trigger=is_trigger,
-            keywords=detected_keywords
-        )
+        return polarity, intensity, tuple(detected_keywords)
     
     def is_high_negative_intensity(self, text: str) -> bool:
         """
         Check if text contains high-intensity negative sentiment.
         
-        This is a convenience method for quick trigger checking.
+        This is a convenience method for quick trigger checking. It reads the
+        shared score cache directly and never builds a SentimentResult.
         
         Args:
             text: Text to analyze
@@ -204,5 +420,10 @@ class SentimentAnalyzer:
         Returns:
             True if text should trigger Vecna emotional response
         """
-        result = self.analyze(text)
-        return result.is_trigger
+        normalized_text = text.strip().lower() if text else ""
+        if not normalized_text:
+            return False
+        
+        self._weight_tables()
+        polarity, intensity, _ = self._score_cached(normalized_text)
+        return polarity < 0 and intensity >= self.intensity_threshold
@@ -10,14 +10,24 @@ Requirements: 7.1, 7.2, 7.3, 7.4, 7.5
 
 import json
 import re
+import sys
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Any, Optional
+from itertools import islice
+from typing import Deque, Dict, List, Tuple, Any, Optional
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 from sqlalchemy.orm import Session
 from backend.database import User, UserProfile as UserProfileModel, CommandHistory, BoardTracking
 
 
+# Burst window for the high-frequency spam heuristic (3+ messages inside it)
+SPAM_BURST_WINDOW = timedelta(seconds=4)
+
+# Number of recent commands kept in memory per profile
+MAX_COMMAND_HISTORY = 50
+
+
 @dataclass
 class UserProfile:
     """
@@ -32,7 +42,8 @@ class UserProfile:
         interests: List of detected interests
         frequent_rooms: Dict mapping room names to visit counts
         recent_rooms: List of recently visited rooms (last 10)
-        command_history: List of recent commands with timestamps
+        command_history: Bounded deque of recent commands with timestamps,
+            most recent first (last MAX_COMMAND_HISTORY entries)
         unfinished_boards: List of boards created but abandoned
         activity_baseline: Statistical baseline for normal activity
         behavioral_patterns: Detected patterns (repetition, spam, etc.)
@@ -42,7 +53,9 @@ class UserProfile:
     interests: List[str] = field(default_factory=list)
     frequent_rooms: Dict[str, int] = field(default_factory=dict)
     recent_rooms: List[str] = field(default_factory=list)
-    command_history: List[Tuple[str, datetime]] = field(default_factory=list)
+    command_history: Deque[Tuple[str, datetime]] = field(
+        default_factory=lambda: deque(maxlen=MAX_COMMAND_HISTORY)
+    )
     unfinished_boards: List[str] = field(default_factory=list)
     activity_baseline: Dict[str, float] = field(default_factory=dict)
     behavioral_patterns: Dict[str, Any] = field(default_factory=dict)
@@ -116,16 +129,18 @@ class UserProfile:
             """Calculate similarity ratio between two strings."""
             return SequenceMatcher(None, a, b).ratio()
         
-        normalized = [normalize(m) for m in recent_messages]
-        
-        # 1. High-frequency check: 3+ messages in 4 seconds
+        # 1. High-frequency check: 3+ messages in 4 seconds (needs no
+        # normalization, so it runs first)
         if timestamps and len(timestamps) >= 3:
             last_five_times = timestamps[-5:] if len(timestamps) >= 5 else timestamps
             if len(last_five_times) >= 3:
-                time_window = (last_five_times[-1] - last_five_times[0]).total_seconds()
-                if time_window < 4:  # 3+ messages in 4 seconds → suspicious
+                # Compare timedeltas directly; 3+ messages in 4 seconds → suspicious
+                if last_five_times[-1] - last_five_times[0] < SPAM_BURST_WINDOW:
                     return True
         
+        # Every text heuristic below looks at the last five messages at most
+        normalized = [normalize(m) for m in recent_messages[-5:]]
+        
         # 2. Fuzzy similarity repetition: last message similar to 2+ previous
         if len(normalized) >= 3:
             last = normalized[-1]
@@ -164,25 +179,23 @@ class UserProfile:
         if len(self.command_history) < 3:
             return False
         
-        now = datetime.utcnow()
-        cutoff_time = now - timedelta(seconds=window_seconds)
-        
-        # Get commands within time window
-        recent_commands = [
-            cmd for cmd, timestamp in self.command_history
-            if timestamp >= cutoff_time
-        ]
-        
-        if len(recent_commands) < 3:
-            return False
-        
-        # Check for repeated commands
-        unique_commands = set(recent_commands)
-        if len(unique_commands) <= 2 and len(recent_commands) >= 3:
-            # 3+ commands with only 1-2 unique values = repetition
-            return True
-        
-        return False
+        # Compute the cutoff once so the scan is a plain datetime comparison
+        cutoff_time = datetime.utcnow() - timedelta(seconds=window_seconds)
+        
+        # 3+ commands with only 1-2 unique values = repetition. History is
+        # most-recent-first, so stop at the first entry outside the window and
+        # bail out as soon as a third distinct command shows up.
+        unique_commands = set()
+        recent_count = 0
+        for cmd, timestamp in self.command_history:
+            if timestamp < cutoff_time:
+                break
+            unique_commands.add(cmd)
+            if len(unique_commands) > 2:
+                return False
+            recent_count += 1
+        
+        return recent_count >= 3
 
 
 class UserProfileService:
@@ -237,15 +250,18 @@ class UserProfileService:
             recent_rooms = json.loads(profile_model.recent_rooms) if profile_model.recent_rooms else []
             activity_baseline = json.loads(profile_model.activity_baseline) if profile_model.activity_baseline else {}
             
-            # Load command history (last 50 commands)
+            # Load command history (last MAX_COMMAND_HISTORY commands)
             command_records = self.db.query(CommandHistory).filter(
                 CommandHistory.user_id == user_id
-            ).order_by(CommandHistory.executed_at.desc()).limit(50).all()
+            ).order_by(CommandHistory.executed_at.desc()).limit(MAX_COMMAND_HISTORY).all()
             
-            command_history = [
-                (record.command, record.executed_at)
-                for record in command_records
-            ]
+            command_history = deque(
+                (
+                    (sys.intern(record.command), record.executed_at)
+                    for record in command_records
+                ),
+                maxlen=MAX_COMMAND_HISTORY
+            )
             
             # Load unfinished boards
             unfinished_board_records = self.db.query(BoardTracking).filter(
@@ -360,12 +376,10 @@ class UserProfileService:
         """
         profile = self.get_profile(user_id)
         
-        # Add to command history
+        # Add to command history (the bounded deque drops the oldest entry).
+        # Commands are interned so repetition checks compare by identity.
         timestamp = datetime.utcnow()
-        profile.command_history.insert(0, (command, timestamp))
-        
-        # Keep only last 50 commands in memory
-        profile.command_history = profile.command_history[:50]
+        profile.command_history.appendleft((sys.intern(command), timestamp))
         
         # Persist to database
         command_record = CommandHistory(
@@ -479,7 +493,7 @@ class UserProfileService:
         # Calculate baseline metrics from command history
         if len(profile.command_history) >= 10:
             # Calculate commands per minute
-            recent_commands = profile.command_history[:20]
+            recent_commands = list(islice(profile.command_history, 20))
             if len(recent_commands) >= 2:
                 time_span = (recent_commands[0][1] - recent_commands[-1][1]).total_seconds()
                 if time_span > 0: